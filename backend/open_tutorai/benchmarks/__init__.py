@@ -0,0 +1 @@
+# OpenTutorAI benchmarks and load tests
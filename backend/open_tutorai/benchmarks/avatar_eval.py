@@ -0,0 +1,184 @@
+"""
+Batch evaluation of the avatar personalities.
+
+Runs every prompt of a JSONL file against each avatar type through
+Pipeline.evaluate(), with bounded concurrency. One JSON line per result is
+appended to the output file as calls finish. Each line holds the reply, its
+latency and token counts, and whether the model's output was valid JSON
+that matched the avatar schema. A summary per avatar type is printed at the
+end.
+
+Each input line is an object with a "prompt", an optional "id" (the line
+number otherwise) and optional "avatar_types" to use instead of the ones
+given on the command line. A line that is a plain JSON string is taken as
+the prompt. Lines that are not JSON or have no prompt are skipped with a
+warning.
+
+Results are keyed "<id>:<avatar_type>". Cases already in an existing output
+file are skipped, so an interrupted run picks up where it stopped.
+--retry-errors runs failed cases again and --restart starts over.
+
+The pipeline is configured as in the pipelines server, from its valves'
+environment variables (GEMINI_API_KEY, AVATAR_PROVIDERS, ...).
+
+Usage:
+    python -m open_tutorai.benchmarks.avatar_eval prompts.jsonl -o results.jsonl \\
+        --avatar-types scholar,mentor,coach,innovator --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline
+
+gemini = load_gemini_pipeline()
+
+
+def read_cases(path, avatar_types):
+    """Yield the cases of the input file, one per prompt and avatar type."""
+    with open(path, encoding="utf-8") as prompts:
+        for number, line in enumerate(prompts, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if isinstance(entry, str):
+                    entry = {"prompt": entry}
+                if not isinstance(entry, dict) or not isinstance(entry.get("prompt"), str):
+                    raise ValueError('no "prompt" string')
+            except ValueError as e:
+                print(f"Skipping line {number} of {path}: {e}", file=sys.stderr)
+                continue
+            case_id = entry.get("id", number)
+            for avatar_type in entry.get("avatar_types") or avatar_types:
+                yield {
+                    "key": f"{case_id}:{avatar_type}",
+                    "id": case_id,
+                    "prompt": entry["prompt"],
+                    "avatar_type": avatar_type,
+                }
+
+
+def read_results(path):
+    """
+    The results already in the output file by key, the last one winning.
+    A line cut off by an interruption is removed so appending can go on.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb+") as output:
+        data = output.read()
+        if data and not data.endswith(b"\n"):
+            data = data[: data.rfind(b"\n") + 1]
+            output.truncate(len(data))
+
+    results = {}
+    for line in data.decode("utf-8").splitlines():
+        try:
+            result = json.loads(line)
+            results[result["key"]] = result
+        except (ValueError, KeyError, TypeError):
+            continue
+    return results
+
+
+def evaluate(pipeline, args):
+    previous = {} if args.restart else read_results(args.output)
+    done = {
+        key
+        for key, result in previous.items()
+        if not (args.retry_errors and result["status"] != 200)
+    }
+    stats = gemini.EvaluationStats()
+    for key in done:
+        stats.add(previous[key])
+
+    cases = (
+        case
+        for case in read_cases(args.input, args.avatar_types)
+        if case["key"] not in done
+    )
+    ran = 0
+    start = time.perf_counter()
+    with open(args.output, "w" if args.restart else "a", encoding="utf-8") as output:
+        try:
+            for result in pipeline.evaluate(cases, args.concurrency):
+                result["key"] = f"{result['id']}:{result['avatar_type']}"
+                # Flushed per line so an interruption loses only calls in flight
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                stats.add(result)
+                ran += 1
+                if args.progress and ran % args.progress == 0:
+                    print(f"{ran} cases run", flush=True)
+        except KeyboardInterrupt:
+            print(f"Interrupted after {ran} cases; run again to resume")
+            return 130
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{ran} cases run in {elapsed:.1f}s ({ran / elapsed if elapsed else 0:.1f}/s), "
+        f"{len(done)} already done"
+    )
+    print_summary(stats.summary())
+    return 0
+
+
+def print_summary(summary):
+    columns = (
+        ("cases", "cases", "{}"),
+        ("errors", "errors", "{}"),
+        ("valid_json", "json", "{:.1%}"),
+        ("schema_valid", "schema", "{:.1%}"),
+        ("p50_ms", "p50 ms", "{:.0f}"),
+        ("p95_ms", "p95 ms", "{:.0f}"),
+        ("mean_prompt_tokens", "prompt tok", "{}"),
+        ("mean_response_tokens", "reply tok", "{}"),
+    )
+    print(f"{'avatar':<12}" + "".join(f"{heading:>11}" for _, heading, _ in columns))
+    for name in sorted(summary, key=lambda name: (name == "all", name)):
+        stats = summary[name]
+        cells = [
+            "-" if stats.get(column) is None else fmt.format(stats[column])
+            for column, _, fmt in columns
+        ]
+        print(f"{name:<12}" + "".join(f"{cell:>11}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="JSONL file of prompts")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file of results")
+    parser.add_argument(
+        "--avatar-types",
+        default="scholar,mentor,coach,innovator",
+        help="Comma-separated avatar types to ask each prompt",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--retry-errors", action="store_true", help="Run failed cases again")
+    parser.add_argument("--restart", action="store_true", help="Ignore earlier results")
+    parser.add_argument(
+        "--progress", type=int, default=0, help="Print progress every this many cases"
+    )
+    args = parser.parse_args()
+    args.avatar_types = [name.strip() for name in args.avatar_types.split(",") if name.strip()]
+    unknown = set(args.avatar_types) - set(gemini.AVATAR_PERSONALITIES)
+    if unknown:
+        parser.error(f"unknown avatar types: {', '.join(sorted(unknown))}")
+
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+    pipeline = gemini.Pipeline()
+    asyncio.run(pipeline.on_startup())
+    try:
+        status = evaluate(pipeline, args)
+    finally:
+        asyncio.run(pipeline.on_shutdown())
+    raise SystemExit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Benchmark: the avatar pipeline's model providers and routing between them.
+
+- protocols: each of the gemini, openai and ollama providers against the
+             local stub, streamed and not; the reply must be the stub's
+             avatar JSON
+- offline:   a load test of the whole avatar path on the mock provider,
+             reporting throughput and latency and checking every reply is
+             avatar JSON with animations of the avatar's gender
+- routing:   a slow Gemini stub and a fast OpenAI-compatible stub behind
+             latency routing; the fast one should take most of the traffic,
+             and when it goes down every call should fail over to the slow one
+
+Usage:
+    python -m open_tutorai.benchmarks.avatar_providers --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_tutorai.benchmarks.gemini_stub import (
+    STUB_REPLY,
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+gemini = load_gemini_pipeline()
+
+# Valves every scenario starts from
+VALVES = {"GEMINI_CONTEXT_TOKENS": 0, "GEMINI_RETRY_BACKOFF": 0.05}
+
+QUESTIONS = [
+    "What is photosynthesis?",
+    "How do vaccines work?",
+    "Why is the sky blue?",
+    "What is a prime number?",
+]
+
+
+def ask(pipeline, question, avatar_type="mentor", stream=False):
+    """Return (reply or None on failure, seconds) of one pipe() call."""
+    messages = [{"role": "user", "content": question}]
+    body = {"avatar_type": avatar_type, "stream": stream}
+    start = time.perf_counter()
+    try:
+        reply = pipeline.pipe(question, pipeline.model, messages, body)
+        if not isinstance(reply, str):
+            reply = "".join(reply)
+    except gemini.UpstreamUnavailable:
+        reply = None
+    if reply is not None and reply.startswith("Error"):
+        reply = None
+    return reply, time.perf_counter() - start
+
+
+async def burst(pipeline, requests, concurrency, avatar_types=("mentor",)):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    ask,
+                    pipeline,
+                    QUESTIONS[i % len(QUESTIONS)],
+                    avatar_types[i % len(avatar_types)],
+                )
+                for i in range(requests)
+            )
+        )
+
+
+async def protocols(args):
+    stub = GeminiStub(latency=0.01)
+    await stub.start()
+    urls = {
+        "gemini": {"GEMINI_API_BASE_URL": stub.base_url},
+        "openai": {"OPENAI_API_BASE_URL": stub.openai_base_url},
+        "ollama": {"OLLAMA_BASE_URL": stub.ollama_base_url},
+    }
+    results = []
+    try:
+        for name, valves in urls.items():
+            pipeline = await make_pipeline(**VALVES, AVATAR_PROVIDERS=name, **valves)
+            try:
+                for stream in (False, True):
+                    reply, _ = await asyncio.to_thread(
+                        ask, pipeline, QUESTIONS[0], stream=stream
+                    )
+                    try:
+                        ok = json.loads(reply or "") == STUB_REPLY
+                    except ValueError:
+                        ok = False
+                    results.append((f"{name}{' stream' if stream else ''}", ok))
+            finally:
+                await pipeline.on_shutdown()
+    finally:
+        await stub.stop()
+
+    passed = all(ok for _, ok in results)
+    return passed, ", ".join(f"{name} {'ok' if ok else 'FAILED'}" for name, ok in results)
+
+
+def valid_mock_reply(reply, avatar_type):
+    try:
+        data = json.loads(reply)
+    except (TypeError, ValueError):
+        return False
+    prefix = gemini.ANIMATION_PREFIX[gemini.AVATAR_GENDER[avatar_type]]
+    return bool(data.get("response")) and data.get("glbAnimation", "").startswith(prefix)
+
+
+async def offline(args):
+    avatar_types = ("scholar", "mentor", "coach", "innovator")
+    pipeline = await make_pipeline(
+        **VALVES, AVATAR_PROVIDERS="mock", MOCK_LATENCY=args.mock_latency
+    )
+    try:
+        start = time.perf_counter()
+        results = await burst(pipeline, args.requests, args.concurrency, avatar_types)
+        elapsed = time.perf_counter() - start
+        again, _ = await asyncio.to_thread(ask, pipeline, QUESTIONS[0], avatar_types[0])
+    finally:
+        await pipeline.on_shutdown()
+
+    valid = sum(
+        valid_mock_reply(reply, avatar_types[i % len(avatar_types)])
+        for i, (reply, _) in enumerate(results)
+    )
+    deterministic = again == results[0][0]
+    latencies = sorted(seconds for _, seconds in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return (
+        valid == args.requests and deterministic,
+        f"{args.requests / elapsed:,.0f} req/s, p50 {statistics.median(latencies) * 1000:.0f}ms "
+        f"p95 {p95 * 1000:.0f}ms, {valid}/{args.requests} valid, "
+        f"{'deterministic' if deterministic else 'NOT deterministic'}",
+    )
+
+
+async def routing(args):
+    slow, fast = GeminiStub(latency=0.3), GeminiStub(latency=0.05)
+    await slow.start()
+    await fast.start()
+    pipeline = await make_pipeline(
+        **VALVES,
+        AVATAR_PROVIDERS="gemini,openai",
+        GEMINI_API_BASE_URL=slow.base_url,
+        OPENAI_API_BASE_URL=fast.openai_base_url,
+        GEMINI_MAX_RETRIES=1,
+    )
+    try:
+        await burst(pipeline, args.requests // 2, 8)
+        shared = dict(pipeline.router.calls)
+        share = shared["openai"] / sum(shared.values())
+
+        # The fast provider goes down: calls fail over to the slow one
+        fast.outage = True
+        results = await burst(pipeline, 40, 8)
+        failed = sum(reply is None for reply, _ in results)
+        stats = pipeline.router.stats()
+    finally:
+        await pipeline.on_shutdown()
+        await slow.stop()
+        await fast.stop()
+
+    return (
+        share >= 2 / 3 and failed == 0,
+        f"fast provider took {share:.0%} of {sum(shared.values())} calls "
+        f"(p95 gemini {stats['gemini']['p95_ms']}ms, openai {stats['openai']['p95_ms']}ms); "
+        f"in its outage {failed}/40 calls failed, {stats['failovers']} failovers",
+    )
+
+
+SCENARIOS = {"protocols": protocols, "offline": offline, "routing": routing}
+
+
+async def run(args):
+    logging.getLogger("avatar_backend").setLevel(logging.CRITICAL)
+    failed = 0
+    for name, scenario in SCENARIOS.items():
+        with quiet():
+            passed, summary = await scenario(args)
+        failed += not passed
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<10} {summary}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--mock-latency", type=float, default=0.05, help="Seconds per mock provider reply"
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: parsing and validating avatar replies on the server.
+
+Times AvatarReplySchema.parse(), which parses a model reply and validates it
+against the compiled avatar schema, on the kinds of output models produce:
+clean JSON, JSON in a code fence, replies cut off mid-JSON, GLB animations
+with the wrong gender's prefix, and plain text. A bare json.loads() of the
+clean reply is timed for comparison. Fails if any kind takes longer than the
+budget per reply, 100us by default.
+
+Usage:
+    python -m open_tutorai.benchmarks.avatar_reply_parsing --repeat 20000
+"""
+import argparse
+import json
+import logging
+import time
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline
+
+REPLY = {
+    "response": (
+        "That's a complex question that requires careful consideration of "
+        "multiple factors and perspectives, so let's take it one step at a time."
+    ),
+    "animation": {
+        "facial_expression": 3,
+        "head_movement": 3,
+        "hand_gesture": 2,
+        "eye_movement": 1,
+        "body_posture": 2,
+    },
+    "glbAnimation": [
+        {"name": "M_Standing_Expressions_013", "category": "expression", "duration": 3.5},
+        {"name": "talking_thoughtful", "category": "expression"},
+        {"name": "M_Standing_Idle_Variations_001", "category": "idle"},
+    ],
+}
+
+
+def corpus():
+    clean = json.dumps(REPLY, indent=2)
+    wrong_gender = json.loads(clean)
+    for animation in wrong_gender["glbAnimation"]:
+        animation["name"] = animation["name"].replace("M_", "F_")
+    return {
+        "clean": clean,
+        "fenced": f"```json\n{clean}\n```",
+        "truncated": clean[: int(len(clean) * 0.7)],
+        "wrong gender": json.dumps(wrong_gender),
+        "plain text": REPLY["response"],
+    }
+
+
+def time_per_call(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument(
+        "--budget-us", type=float, default=100.0, help="Fail above this many us per reply"
+    )
+    args = parser.parse_args()
+
+    gemini = load_gemini_pipeline()
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+    schema = gemini.AvatarReplySchema("male")
+
+    replies = corpus()
+    print(f"{'reply':<14} {'bytes':>6} {'parse':>9} {'+ to_json':>10}  repairs")
+    print(
+        f"{'json.loads':<14} {len(replies['clean']):>6} "
+        f"{time_per_call(json.loads, replies['clean'], args.repeat) * 1e6:>7.1f}us"
+    )
+
+    slowest = 0.0
+    for kind, text in replies.items():
+        parse = time_per_call(schema.parse, text, args.repeat)
+        serialize = time_per_call(lambda t: schema.parse(t).to_json(), text, args.repeat)
+        slowest = max(slowest, parse)
+        repairs = schema.parse(text).repairs
+        print(
+            f"{kind:<14} {len(text):>6} {parse * 1e6:>7.1f}us {serialize * 1e6:>8.1f}us  "
+            f"{len(repairs)}"
+        )
+
+    raise SystemExit(0 if slowest * 1e6 <= args.budget_us else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Benchmark: per-user rate limiting and usage accounting in the avatar pipeline.
+
+- limits:     one user floods an avatar with requests; only the burst gets
+              through and the rest get a 429, while other users and the same
+              user's other avatars are unaffected
+- tokens:     a model token allowance per hour runs out after the calls it
+              covers, charged with the usage the provider reports
+- accounting: each API the stub speaks, streamed and not; the tokens the
+              ledger records must be the ones the stub reported
+- overhead:   a load of calls from many users through the limiter and the
+              ledger, written to SQLite in the background; reports the cost
+              per call and of a quota check, and checks the database got a
+              handful of batched writes whose totals match the calls
+
+Usage:
+    python -m open_tutorai.benchmarks.avatar_usage --requests 20000 --users 1000
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_tutorai.benchmarks.gemini_stub import (
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+gemini = load_gemini_pipeline()
+
+# Valves every scenario starts from
+VALVES = {"GEMINI_CONTEXT_TOKENS": 0}
+
+
+def ask(pipeline, user_id, avatar_type="mentor", stream=False):
+    """Return the status of one pipe() call, 200 for a reply."""
+    question = "What is photosynthesis?"
+    messages = [{"role": "user", "content": question}]
+    body = {"avatar_type": avatar_type, "stream": stream, "user": {"id": user_id}}
+    try:
+        reply = pipeline.pipe(question, pipeline.model, messages, body)
+        if not isinstance(reply, str):
+            "".join(reply)
+        return 200
+    except (gemini.RateLimited, gemini.UpstreamUnavailable) as e:
+        return e.status_code
+
+
+async def burst(pipeline, calls, concurrency=16):
+    """Run (user_id, avatar_type) calls at once, returning their statuses."""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, ask, pipeline, *call) for call in calls)
+        )
+
+
+async def limits(args):
+    pipeline = await make_pipeline(
+        **VALVES,
+        AVATAR_PROVIDERS="mock",
+        AVATAR_RATE_LIMIT_PER_MINUTE=30,
+        AVATAR_RATE_LIMIT_BURST=10,
+    )
+    try:
+        flood = await burst(pipeline, [("spammer", "mentor")] * 100)
+        others = await burst(
+            pipeline, [("student", "mentor")] * 10 + [("spammer", "scholar")] * 10
+        )
+        quota = pipeline.check_quota("spammer", "mentor")
+        totals = pipeline.usage.totals("spammer")["mentor"]
+    finally:
+        await pipeline.on_shutdown()
+
+    admitted = flood.count(200)
+    return (
+        # The bucket refills by one every 2s, which a fast burst may catch
+        10 <= admitted <= 11
+        and flood.count(429) == 100 - admitted
+        and others.count(200) == 20
+        and not quota["allowed"]
+        and totals["requests"] == admitted
+        and totals["rejected"] == 100 - admitted,
+        f"flood of 100: {admitted} admitted, {flood.count(429)} got 429; "
+        f"other user and avatar: {others.count(200)}/20 answered; "
+        f"quota check: retry in {quota['retry_after']:.1f}s",
+    )
+
+
+async def tokens(args):
+    stub = GeminiStub(latency=0.01)
+    await stub.start()
+    pipeline = await make_pipeline(
+        **VALVES,
+        GEMINI_API_BASE_URL=stub.base_url,
+        AVATAR_RATE_LIMIT_PER_MINUTE=0,
+        AVATAR_TOKEN_LIMIT_PER_HOUR=args.tokens_per_hour,
+    )
+    try:
+        statuses = [await asyncio.to_thread(ask, pipeline, "reader") for _ in range(20)]
+        quota = pipeline.check_quota("reader", "mentor")
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    # Calls are allowed while any allowance is left, the last one going into debt
+    per_call = stub.tokens_reported / statuses.count(200)
+    expected = -(-args.tokens_per_hour // per_call)
+    return (
+        statuses.count(200) == expected and statuses[-1] == 429 and quota["tokens_remaining"] < 0,
+        f"{args.tokens_per_hour:,} tokens/hour at ~{per_call:,.0f} tokens per call: "
+        f"{statuses.count(200)} answered, then 429; "
+        f"{quota['tokens_remaining']:,} tokens left, retry in {quota['retry_after']:.0f}s",
+    )
+
+
+async def accounting(args):
+    stub = GeminiStub(latency=0.01)
+    await stub.start()
+    providers = {
+        "gemini": {"GEMINI_API_BASE_URL": stub.base_url},
+        "openai": {"OPENAI_API_BASE_URL": stub.openai_base_url},
+        "ollama": {"OLLAMA_BASE_URL": stub.ollama_base_url},
+    }
+    results = []
+    try:
+        for name, valves in providers.items():
+            pipeline = await make_pipeline(**VALVES, AVATAR_PROVIDERS=name, **valves)
+            try:
+                for stream in (False, True):
+                    reported = stub.tokens_reported
+                    user_id = f"{name}-{stream}"
+                    status = await asyncio.to_thread(ask, pipeline, user_id, stream=stream)
+                    usage = pipeline.usage.totals(user_id)["mentor"]
+                    recorded = usage["prompt_tokens"] + usage["response_tokens"]
+                    results.append(
+                        (
+                            f"{name}{' stream' if stream else ''}",
+                            status == 200 and recorded == stub.tokens_reported - reported,
+                        )
+                    )
+            finally:
+                await pipeline.on_shutdown()
+    finally:
+        await stub.stop()
+
+    passed = all(ok for _, ok in results)
+    return passed, ", ".join(f"{name} {'ok' if ok else 'MISMATCH'}" for name, ok in results)
+
+
+async def overhead(args):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "usage.db")
+        pipeline = await make_pipeline(
+            **VALVES,
+            AVATAR_PROVIDERS="mock",
+            AVATAR_USAGE_DB=path,
+            AVATAR_USAGE_FLUSH_INTERVAL=0.2,
+            AVATAR_TOKEN_LIMIT_PER_HOUR=10_000_000,
+        )
+        await pipeline.on_startup()
+        calls = [
+            (f"user-{i % args.users}", ("scholar", "mentor", "coach")[i % 3])
+            for i in range(args.requests)
+        ]
+        start = time.perf_counter()
+        statuses = await burst(pipeline, calls, args.concurrency)
+        elapsed = time.perf_counter() - start
+
+        # The same calls with the limiter and the ledger bypassed
+        pipeline._admit = lambda user_id, avatar_type: None
+        pipeline._account = lambda user_id, avatar_type, usage, start: None
+        start = time.perf_counter()
+        await burst(pipeline, calls, args.concurrency)
+        bare = time.perf_counter() - start
+
+        check = time.perf_counter()
+        for user_id, avatar_type in calls[:10000]:
+            pipeline.check_quota(user_id, avatar_type)
+        check = (time.perf_counter() - check) / min(len(calls), 10000)
+
+        await pipeline.on_shutdown()
+        writes = pipeline.usage.store.writes
+        with contextlib.closing(sqlite3.connect(path)) as connection:
+            stored, users = connection.execute(
+                "SELECT SUM(requests), COUNT(DISTINCT user_id) FROM avatar_usage"
+            ).fetchone()
+
+    per_call = (elapsed - bare) / args.requests
+    return (
+        statuses.count(200) == args.requests
+        and stored == args.requests
+        and users == args.users
+        and writes <= elapsed / 0.2 + 2,
+        f"{args.requests / elapsed:,.0f} req/s, {per_call * 1e6:+.1f}us per call for limiting "
+        f"and accounting, quota check {check * 1e6:.1f}us; "
+        f"{args.requests:,} calls stored in {writes} writes ({stored:,} requests, {users} users)",
+    )
+
+
+SCENARIOS = {"limits": limits, "tokens": tokens, "accounting": accounting, "overhead": overhead}
+
+
+async def run(args):
+    logging.getLogger("avatar_backend").setLevel(logging.CRITICAL)
+    failed = 0
+    for name, scenario in SCENARIOS.items():
+        with quiet():
+            passed, summary = await scenario(args)
+        failed += not passed
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<11} {summary}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--tokens-per-hour", type=int, default=10000, help="Token allowance in the tokens scenario"
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
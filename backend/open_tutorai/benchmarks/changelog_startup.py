@@ -0,0 +1,109 @@
+"""
+Benchmark: what the changelog costs at startup and on its first request.
+
+Each measurement runs in fresh interpreters, as worker startup does, and
+reports the median:
+
+- import open_tutorai.env, which used to parse CHANGELOG.md with markdown
+  and BeautifulSoup at import time, now and with that parse added back
+- import open_tutorai.main, when the app's dependencies are installed
+- the first /api/changelog body, from the changelog compiled at build time
+  and from the markdown fallback
+
+The changelog is compiled in place for the run, as hatch_build.py does, and
+removed again if it was not there before.
+
+Usage:
+    python -m open_tutorai.benchmarks.changelog_startup --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from open_tutorai.utils import changelog
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# The work env.py used to do on import
+EAGER_PARSE = (
+    "from open_tutorai.utils.changelog import parse_changelog, read_changelog_markdown; "
+    "parse_changelog(read_changelog_markdown())"
+)
+FIRST_REQUEST = (
+    "from open_tutorai.utils.changelog import changelog_response; changelog_response()"
+)
+
+
+def measure(statement, runs, setup="pass"):
+    """Median seconds `statement` takes in a fresh interpreter, or the error it raised."""
+    script = (
+        f"import time\n{setup}\nstart = time.perf_counter()\n{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            return result.stderr.strip().splitlines()[-1]
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def report(name, seconds, baseline=None):
+    if isinstance(seconds, str):
+        print(f"{name:<44} skipped: {seconds}")
+        return
+    line = f"{name:<44} {seconds * 1000:8.1f}ms"
+    if isinstance(baseline, float):
+        line += f"  (was {baseline * 1000:.1f}ms, {(baseline - seconds) * 1000:.1f}ms saved)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    compiled = changelog.COMPILED_CHANGELOG_PATH
+    existed = compiled.exists()
+    changelog.compile_changelog()
+    try:
+        env_now = measure("import open_tutorai.env", args.runs)
+        env_before = measure(f"import open_tutorai.env; {EAGER_PARSE}", args.runs)
+        parse = measure(EAGER_PARSE, args.runs, setup="import open_tutorai.env")
+        main_now = measure("import open_tutorai.main", args.runs)
+        main_before = main_now + parse if isinstance(main_now, float) else None
+
+        from_compiled = measure(FIRST_REQUEST, args.runs)
+        # A CHANGELOG.md newer than the compiled file makes the loader parse it
+        os.utime(compiled, (0, 0))
+        from_markdown = measure(FIRST_REQUEST, args.runs)
+    finally:
+        if existed:
+            os.utime(compiled)
+        else:
+            compiled.unlink()
+
+    report("import open_tutorai.env", env_now, env_before)
+    report("import open_tutorai.main", main_now, main_before)
+    report("first /api/changelog body, compiled", from_compiled)
+    report("first /api/changelog body, markdown fallback", from_markdown)
+
+    # Only open_tutorai.main may be skipped, without the app's dependencies
+    measured = (env_now, env_before, from_compiled, from_markdown)
+    if any(isinstance(seconds, str) for seconds in measured):
+        raise SystemExit(1)
+    raise SystemExit(0 if env_now < env_before and from_compiled < from_markdown else 1)
+
+
+if __name__ == "__main__":
+    main()
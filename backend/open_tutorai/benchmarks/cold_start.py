@@ -0,0 +1,260 @@
+"""
+Benchmark: cold start of an Open TutorAI worker.
+
+- imports: `python -X importtime` of open_tutorai.main in a fresh
+  interpreter, reported as a tree of the slowest imports by cumulative
+  time, the time per top-level package, and how much of it is
+  open_tutorai's own modules
+- startup: time from launching uvicorn on open_tutorai.main:app until
+  POST /tutorai/health first answers, which includes the startup
+  handlers, and the worker's RSS at that point; the median of --runs
+  launches
+
+Budgets given with --max-import-ms, --max-healthy-ms and --max-rss-mb fail
+the run when exceeded, so CI can catch startup regressions, and --json
+writes the measurements for tracking over time. --compare prints the
+change from measurements written earlier, such as those of the commit
+before a change. Startup varies by a second or more between launches, so
+compare medians of several runs.
+
+Usage:
+    python -m open_tutorai.benchmarks.cold_start --runs 3 --max-healthy-ms 20000
+    python -m open_tutorai.benchmarks.cold_start --runs 5 --compare before.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def child_env():
+    path = os.pathsep.join(filter(None, [str(BACKEND_DIR), os.environ.get("PYTHONPATH")]))
+    return {**os.environ, "PYTHONPATH": path}
+
+
+class ImportNode:
+    def __init__(self, name, self_us, cumulative_us, children):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = children
+
+
+def profile_imports(module):
+    """
+    The import tree of `module` in a fresh interpreter. importtime lists
+    each module after the modules it imported, indented one level deeper.
+    """
+    # Once to write bytecode caches, as a deployed worker has them
+    for _ in range(2):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BACKEND_DIR,
+            env=child_env(),
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    pending = {}  # depth -> nodes waiting for their parent
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(
+            name.strip(), int(self_us), int(cumulative_us), pending.pop(depth + 1, [])
+        )
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def walk(nodes):
+    for node in nodes:
+        yield node
+        yield from walk(node.children)
+
+
+def print_tree(nodes, min_us, max_depth, depth=0):
+    for node in sorted(nodes, key=lambda node: -node.cumulative_us):
+        if node.cumulative_us < min_us:
+            break
+        print(
+            f"{node.cumulative_us / 1000:9.1f}ms {node.self_us / 1000:8.1f}ms  "
+            f"{'  ' * depth}{node.name}"
+        )
+        if depth + 1 < max_depth:
+            print_tree(node.children, min_us, max_depth, depth + 1)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        import psutil
+
+        return psutil.Process(pid).memory_info().rss / 1024 / 1024
+    return None
+
+
+def start_worker(app, timeout):
+    """Launch uvicorn on the app; return (seconds until healthy, RSS in MB)."""
+    port = free_port()
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=child_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if worker.poll() is not None:
+                raise RuntimeError(worker.stderr.read().strip().splitlines()[-1])
+            try:
+                request = urllib.request.Request(
+                    f"http://127.0.0.1:{port}/tutorai/health", method="POST"
+                )
+                with urllib.request.urlopen(request, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start, rss_mb(worker.pid)
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"not healthy after {timeout}s")
+    finally:
+        worker.terminate()
+        try:
+            worker.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+def print_comparison(before, after):
+    print(f"\n{'':<22}{'before':>10}{'after':>10}{'change':>10}")
+    rows = [
+        ("import ms", before["import_ms"], after["import_ms"]),
+        ("healthy ms", before["healthy_ms"], after["healthy_ms"]),
+        ("RSS MB", before["rss_mb"], after["rss_mb"]),
+    ]
+    packages = sorted(
+        set(before["packages_ms"]) | set(after["packages_ms"]),
+        key=lambda package: -abs(
+            after["packages_ms"].get(package, 0.0) - before["packages_ms"].get(package, 0.0)
+        ),
+    )
+    for package in ["open_tutorai"] + [p for p in packages if p != "open_tutorai"][:5]:
+        rows.append(
+            (
+                f"  {package}",
+                before["packages_ms"].get(package, 0.0),
+                after["packages_ms"].get(package, 0.0),
+            )
+        )
+    for name, old, new in rows:
+        print(f"{name:<22}{old:>10.1f}{new:>10.1f}{new - old:>+10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="open_tutorai.main", help="Module to profile imports of")
+    parser.add_argument("--app", default="open_tutorai.main:app", help="ASGI app to launch")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for health")
+    parser.add_argument("--min-ms", type=float, default=10.0, help="Hide imports faster than this")
+    parser.add_argument("--depth", type=int, default=4, help="Levels of the import tree to show")
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-healthy-ms", type=float)
+    parser.add_argument("--max-rss-mb", type=float)
+    parser.add_argument("--json", metavar="PATH", help="Write the measurements here")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Print the change from measurements written with --json"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    try:
+        roots = profile_imports(args.module)
+    except RuntimeError as e:
+        raise SystemExit(f"Could not import {args.module}: {e}")
+    target = next(node for node in walk(roots) if node.name == args.module)
+    results["import_ms"] = round(target.cumulative_us / 1000, 1)
+
+    print(f"import {args.module}: {results['import_ms']:.1f}ms")
+    print(f"\n{'cumulative':>11} {'self':>10}  module")
+    print_tree(roots, args.min_ms * 1000, args.depth)
+
+    packages = {}
+    for node in walk([target]):
+        package = node.name.split(".")[0]
+        packages[package] = packages.get(package, 0) + node.self_us
+    results["packages_ms"] = {
+        package: round(us / 1000, 1)
+        for package, us in sorted(packages.items(), key=lambda item: -item[1])
+    }
+    print("\nself time by package")
+    for package, ms in list(results["packages_ms"].items())[:15]:
+        print(f"{ms:9.1f}ms  {package}")
+    own_ms = results["packages_ms"].get("open_tutorai", 0.0)
+    print(
+        f"open_tutorai's own modules: {own_ms:.1f}ms "
+        f"({own_ms / results['import_ms'] if results['import_ms'] else 0:.1%} of the import)"
+    )
+
+    healthy, rss = [], []
+    for _ in range(args.runs):
+        try:
+            seconds, megabytes = start_worker(args.app, args.timeout)
+        except RuntimeError as e:
+            raise SystemExit(f"Could not start {args.app}: {e}")
+        healthy.append(seconds)
+        rss.append(megabytes)
+    results["healthy_ms"] = round(statistics.median(healthy) * 1000, 1)
+    results["rss_mb"] = round(statistics.median(rss), 1)
+    print(
+        f"\nfirst healthy /tutorai/health: {results['healthy_ms']:.0f}ms "
+        f"(median of {args.runs}), RSS {results['rss_mb']:.1f}MB"
+    )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), results)
+
+    over = [
+        f"{name} {results[key]} > {limit}"
+        for name, key, limit in (
+            ("import ms", "import_ms", args.max_import_ms),
+            ("healthy ms", "healthy_ms", args.max_healthy_ms),
+            ("RSS MB", "rss_mb", args.max_rss_mb),
+        )
+        if limit is not None and results[key] > limit
+    ]
+    if over:
+        print(f"FAIL  over budget: {', '.join(over)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
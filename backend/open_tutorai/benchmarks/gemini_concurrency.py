@@ -0,0 +1,110 @@
+"""
+Benchmark: concurrent avatar requests through the Gemini pipeline.
+
+Starts the local Gemini stub with a fixed latency, points the pipeline at it
+and fires N pipe() calls at once from worker threads, as the pipelines server
+does. With the pooled async client the calls overlap upstream, so the batch
+should take about one upstream latency rather than N of them.
+
+A second batch then checks keep-alive: it must be served entirely on the
+connections the first one opened. The client speaks HTTP/1.1, one request
+per connection at a time, so the pool holds up to --max-concurrency
+connections per provider and reuses them.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_concurrency --requests 32 --latency 0.5
+"""
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_tutorai.benchmarks.gemini_stub import (
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+
+async def run(args):
+    stub = GeminiStub(latency=args.latency)
+    base_url = await stub.start()
+
+    gemini = load_gemini_pipeline()
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+    pipeline = await make_pipeline(
+        GEMINI_API_BASE_URL=base_url, GEMINI_MAX_CONCURRENCY=args.max_concurrency
+    )
+    await pipeline.on_startup()
+
+    messages = [{"role": "user", "content": "Explain the chain rule"}]
+    body = {"avatar_type": "scholar"}
+
+    def call(_):
+        start = time.perf_counter()
+        try:
+            reply = pipeline.pipe("Explain the chain rule", pipeline.model, messages, body)
+        except gemini.UpstreamUnavailable as e:
+            reply = f"Error: {e.status_code} {e.detail}"
+        return time.perf_counter() - start, reply
+
+    loop = asyncio.get_running_loop()
+    try:
+        # Warm the connection pool so the batch measures steady state; the
+        # pipeline prints a line per call, which would drown the report
+        with ThreadPoolExecutor(max_workers=args.requests) as executor, quiet():
+            await loop.run_in_executor(executor, call, None)
+            stub.max_in_flight = 0
+
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(loop.run_in_executor(executor, call, i) for i in range(args.requests))
+            )
+            elapsed = time.perf_counter() - start
+
+            opened = len(stub.connections)
+            await asyncio.gather(
+                *(loop.run_in_executor(executor, call, i) for i in range(args.requests))
+            )
+            reopened = len(stub.connections) - opened
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    errors = [reply for _, reply in results if reply.startswith("Error")]
+    slowest = max(latency for latency, _ in results)
+    ratio = elapsed / args.latency
+
+    print(f"requests:            {args.requests}")
+    print(f"upstream latency:    {args.latency * 1000:.0f}ms")
+    print(f"max in flight:       {stub.max_in_flight}")
+    print(f"slowest request:     {slowest * 1000:.0f}ms")
+    print(f"batch wall time:     {elapsed * 1000:.0f}ms ({ratio:.2f}x upstream latency)")
+    print(
+        f"connections:         {opened} for {stub.requests - args.requests} requests, "
+        f"{reopened} more for the next {args.requests}"
+    )
+    if errors:
+        print(f"errors: {len(errors)} (first: {errors[0]})")
+        return 1
+    return 0 if ratio <= args.max_ratio and not reopened else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=2.0,
+        help="Fail if the batch takes longer than this multiple of the upstream latency",
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
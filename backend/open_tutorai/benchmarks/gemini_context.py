@@ -0,0 +1,107 @@
+"""
+Benchmark: prompt size and latency over long avatar conversations.
+
+Plays a 100-turn conversation through pipe() against the local Gemini stub,
+whose latency grows with the request size as a real model's does, with:
+
+- full:      every earlier turn sent verbatim (unbounded context)
+- drop:      recent turns packed into the token budget, older ones dropped
+- summarize: recent turns packed into the budget, older ones summarized
+
+and reports the request bytes and latency of each turn, plus the number of
+summarization calls.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_context --turns 100 --budget 2000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from open_tutorai.benchmarks.gemini_stub import GeminiStub, make_pipeline, quiet
+
+STRATEGIES = {
+    "full": {"GEMINI_CONTEXT_TOKENS": 10**9, "GEMINI_CONTEXT_SUMMARY": False},
+    "drop": {"GEMINI_CONTEXT_SUMMARY": False},
+    "summarize": {"GEMINI_CONTEXT_SUMMARY": True},
+}
+
+
+def student_message(turn):
+    return (
+        f"Question {turn}: I worked through exercise {turn} on derivatives of "
+        f"composite functions and got a different sign from the answer key. "
+        f"Could you walk me through where the chain rule applies here?"
+    )
+
+
+def play(pipeline, turns):
+    """Run the conversation, returning the latency of each turn."""
+    messages, results = [], []
+    for turn in range(turns):
+        prompt = student_message(turn)
+        messages.append({"role": "user", "content": prompt})
+        body = {"avatar_type": "scholar", "chat_id": "benchmark-chat"}
+
+        start = time.perf_counter()
+        reply = pipeline.pipe(prompt, pipeline.model, messages, body)
+        results.append(time.perf_counter() - start)
+        messages.append({"role": "assistant", "content": reply})
+    return results
+
+
+async def run_strategy(args, valves):
+    stub = GeminiStub(latency=args.latency, latency_per_kb=args.latency_per_kb)
+    base_url = await stub.start()
+
+    # A strategy's own valves override the budget
+    pipeline = await make_pipeline(
+        **{"GEMINI_API_BASE_URL": base_url, "GEMINI_CONTEXT_TOKENS": args.budget, **valves}
+    )
+
+    try:
+        with quiet():
+            latencies = await asyncio.to_thread(play, pipeline, args.turns)
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    return latencies, stub.request_bytes, pipeline.context.summaries_made
+
+
+async def run(args):
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+
+    print(
+        f"{'strategy':<10} {'last turn':>10} {'max req':>9} {'total sent':>11} "
+        f"{'p50 turn':>9} {'last 10':>9} {'summaries':>10}"
+    )
+    for name, valves in STRATEGIES.items():
+        latencies, request_bytes, summaries = await run_strategy(args, valves)
+        print(
+            f"{name:<10} {request_bytes[-1]:>9,}B {max(request_bytes):>8,}B "
+            f"{sum(request_bytes) / 1024:>9,.0f}KB "
+            f"{statistics.median(latencies) * 1000:>7.0f}ms "
+            f"{statistics.fmean(latencies[-10:]) * 1000:>7.0f}ms {summaries:>10}"
+        )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--budget", type=int, default=2000, help="Context budget in tokens")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument(
+        "--latency-per-kb",
+        type=float,
+        default=0.002,
+        help="Extra upstream latency per KB of request",
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: bytes sent to Gemini per avatar request.
+
+Sends the same prompts for every avatar type to the local Gemini stub, once
+with the system prompt inline as a systemInstruction and once with Gemini
+context caching, and reports the request body size the stub received. The
+previous payload, the system prompt and the question concatenated into one
+user message, is rebuilt for comparison. JSON mode is off for these runs so
+the rows compare the prompt alone; the bytes its responseSchema adds to every
+request are reported on their own line. Prompt build time per request is
+reported as well.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_prompt_size
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from open_tutorai.benchmarks.gemini_stub import (
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+PROMPTS = [
+    "Hi!",
+    "Can you explain the chain rule with an example?",
+    "What were the main causes of the French Revolution, and how did they interact?",
+]
+
+
+def legacy_payload(gemini, pipeline, prompt, avatar_type):
+    """The request body as it was built, on every call, before this change."""
+    full_prompt = (
+        gemini.AVATAR_PERSONALITIES[avatar_type]
+        + pipeline._get_animation_instructions(avatar_type)
+        + "\nThe user's question is: "
+        + prompt
+    )
+    return {"contents": [{"parts": [{"text": full_prompt}]}]}
+
+
+def request(pipeline, provider, prompt, avatar_type, json_mode=False):
+    """The generateContent body with the system prompt inline, optionally in JSON mode."""
+    return provider.build_request(
+        pipeline.system_prompts[avatar_type],
+        pipeline._build_contents(prompt, avatar_type),
+        avatar_type,
+        response_schema=(
+            pipeline._reply_schema(avatar_type).response_schema if json_mode else None
+        ),
+    )
+
+
+def time_per_call(fn, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+async def send_all(pipeline, stub, avatar_types):
+    stub.request_bytes.clear()
+    for avatar_type in avatar_types:
+        for prompt in PROMPTS:
+            await asyncio.to_thread(pipeline._call_model, prompt, avatar_type)
+    return list(stub.request_bytes)
+
+
+async def run(args):
+    stub = GeminiStub(latency=0.0)
+    base_url = await stub.start()
+
+    gemini = load_gemini_pipeline()
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+    pipeline = await make_pipeline(GEMINI_API_BASE_URL=base_url, AVATAR_JSON_MODE=False)
+    avatar_types = list(gemini.AVATAR_PERSONALITIES)
+
+    try:
+        with quiet():
+            inline = await send_all(pipeline, stub, avatar_types)
+
+            pipeline.valves.GEMINI_CONTEXT_CACHE = True
+            await pipeline.on_valves_updated()
+            cached = await send_all(pipeline, stub, avatar_types)
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    before = [
+        len(json.dumps(legacy_payload(gemini, pipeline, prompt, avatar_type)).encode())
+        for avatar_type in avatar_types
+        for prompt in PROMPTS
+    ]
+
+    provider = pipeline.providers[0]
+    provider.context_cache = False
+    schema = [
+        len(json.dumps(request(pipeline, provider, prompt, avatar_type, json_mode=True)))
+        - len(json.dumps(request(pipeline, provider, prompt, avatar_type)))
+        for avatar_type in avatar_types
+        for prompt in PROMPTS
+    ]
+    build_before = time_per_call(
+        lambda: legacy_payload(gemini, pipeline, PROMPTS[1], "scholar")
+    )
+    build_after = time_per_call(
+        lambda: request(pipeline, provider, PROMPTS[1], "scholar")
+    )
+
+    print(f"{'payload':<28} {'mean bytes/request':>20}")
+    for name, sizes in (
+        ("before (prompt in message)", before),
+        ("systemInstruction", inline),
+        ("context cache", cached),
+    ):
+        print(f"{name:<28} {statistics.fmean(sizes):20,.0f}")
+    print(f"{'+ JSON mode responseSchema':<28} {statistics.fmean(schema):20,.0f}")
+    print(f"\ncontext caches created: {len(stub.cached_contents)}")
+    print(
+        f"prompt build: {build_before * 1e6:.1f}us before, "
+        f"{build_after * 1e6:.1f}us after"
+    )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
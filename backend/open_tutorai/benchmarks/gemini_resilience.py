@@ -0,0 +1,175 @@
+"""
+Fault-injection scenarios for the Gemini pipeline's upstream protections.
+
+Each scenario runs pipe() calls against the local Gemini stub with faults
+injected and checks the expected behaviour:
+
+- flaky:      30% of requests fail with a 503; retries hide them
+- rate-limit: the first requests get a 429 with Retry-After; the call waits
+              at least that long and then succeeds
+- outage:     every request fails; the circuit breaker opens and fails
+              further calls fast without reaching Gemini, then a probe
+              closes it once Gemini recovers
+- overload:   a burst far above the concurrency limit; calls beyond the
+              admission queue are shed at once with a 503
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_resilience
+"""
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_tutorai.benchmarks.gemini_stub import (
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+gemini = load_gemini_pipeline()
+
+# Valves every scenario starts from: short backoffs so scenarios finish quickly
+VALVES = {
+    "GEMINI_RETRY_BACKOFF": 0.05,
+    "GEMINI_RETRY_MAX_BACKOFF": 1.0,
+    "GEMINI_CONTEXT_TOKENS": 0,
+}
+
+
+def ask(pipeline):
+    """Return (status, seconds) of one pipe() call, 200 for a reply."""
+    messages = [{"role": "user", "content": "What is photosynthesis?"}]
+    start = time.perf_counter()
+    try:
+        pipeline.pipe("What is photosynthesis?", pipeline.model, messages, {})
+        status = 200
+    except gemini.UpstreamUnavailable as e:
+        status = e.status_code
+    return status, time.perf_counter() - start
+
+
+async def burst(pipeline, calls, concurrency):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, ask, pipeline) for _ in range(calls))
+        )
+
+
+async def flaky():
+    stub = GeminiStub(latency=0.01, fail_rate=0.3, seed=1)
+    pipeline = await make_pipeline(
+        **VALVES,
+        GEMINI_API_BASE_URL=await stub.start(),
+        GEMINI_MAX_RETRIES=8,
+        GEMINI_BREAKER_FAILURES=10,
+    )
+    results = await burst(pipeline, 200, 10)
+    ok = sum(status == 200 for status, _ in results)
+    return (
+        ok == 200,
+        f"{ok}/200 answered, {stub.failures} injected failures, "
+        f"{pipeline.providers[0].client.retries} retries",
+        pipeline,
+        stub,
+    )
+
+
+async def rate_limit():
+    stub = GeminiStub(latency=0.01, fail_first=2, fail_status=429, retry_after=0.3)
+    pipeline = await make_pipeline(**VALVES, GEMINI_API_BASE_URL=await stub.start())
+    [(status, elapsed)] = await burst(pipeline, 1, 1)
+    return (
+        status == 200 and elapsed >= 0.6,
+        f"status {status} after {elapsed * 1000:.0f}ms (2 x Retry-After 300ms)",
+        pipeline,
+        stub,
+    )
+
+
+async def outage():
+    stub = GeminiStub(latency=0.01)
+    stub.outage = True
+    pipeline = await make_pipeline(
+        **VALVES,
+        GEMINI_API_BASE_URL=await stub.start(),
+        GEMINI_MAX_RETRIES=0,
+        GEMINI_BREAKER_FAILURES=5,
+        GEMINI_BREAKER_RESET=1.0,
+    )
+    failing = [await asyncio.to_thread(ask, pipeline) for _ in range(20)]
+    reached = stub.requests
+    fast = max(elapsed for _, elapsed in failing[5:])
+
+    stub.outage = False
+    await asyncio.sleep(1.1)
+    probe, _ = await asyncio.to_thread(ask, pipeline)
+    return (
+        reached == 5 and probe == 200 and pipeline.providers[0].client.breaker.state == "closed",
+        f"{reached}/20 calls reached Gemini, the rest failed in <={fast * 1000:.1f}ms "
+        f"with {failing[-1][0]}; probe after recovery: {probe}",
+        pipeline,
+        stub,
+    )
+
+
+async def overload():
+    stub = GeminiStub(latency=0.5)
+    pipeline = await make_pipeline(
+        **VALVES,
+        GEMINI_API_BASE_URL=await stub.start(),
+        GEMINI_MAX_CONCURRENCY=4,
+        GEMINI_MAX_QUEUE=8,
+        GEMINI_QUEUE_TIMEOUT=5.0,
+    )
+    results = await burst(pipeline, 40, 40)
+    ok = [elapsed for status, elapsed in results if status == 200]
+    shed = [elapsed for status, elapsed in results if status == 503]
+    return (
+        len(ok) == 12 and len(shed) == 28,
+        f"{len(ok)} answered, {len(shed)} shed with 503 in "
+        f"<={max(shed, default=0) * 1000:.0f}ms, max in flight {stub.max_in_flight}",
+        pipeline,
+        stub,
+    )
+
+
+SCENARIOS = {
+    "flaky": flaky,
+    "rate-limit": rate_limit,
+    "outage": outage,
+    "overload": overload,
+}
+
+
+async def run(args):
+    logging.getLogger("avatar_backend").setLevel(logging.CRITICAL)
+    failed = 0
+    for name in args.scenarios:
+        with quiet():
+            passed, summary, pipeline, stub = await SCENARIOS[name]()
+            await pipeline.on_shutdown()
+            await stub.stop()
+        failed += not passed
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<11} {summary}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "scenarios", nargs="*", metavar="scenario", help=f"One of {', '.join(SCENARIOS)}"
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    raise SystemExit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: a class asking the avatar the same few questions.
+
+Against the local Gemini stub, a burst of students asks a handful of
+questions, in varied case and punctuation, all at once and then again a
+little later. It runs with the response cache off and on and reports the
+upstream calls made, the cache counters and the wall time of each wave.
+With the cache on, each distinct question should reach Gemini once: the
+first wave is coalesced and the second is served from the cache.
+
+With the cache on, two streamed waves follow:
+
+- fan-out: the class streams one new question at once. It should reach
+  Gemini once, and every student should see the reply start before the
+  leading stream ends, rather than wait for all of it.
+- stall:   the students join a call that never finishes. Each should give
+  up after the cache's wait timeout (--wait) and stream its own reply.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_response_cache --students 30 --questions 3
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_tutorai.benchmarks.gemini_stub import (
+    GeminiStub,
+    load_gemini_pipeline,
+    make_pipeline,
+    quiet,
+)
+
+QUESTIONS = [
+    "What is photosynthesis?",
+    "How do vaccines work?",
+    "Why is the sky blue?",
+    "What is a prime number?",
+    "Who wrote Hamlet?",
+]
+VARIANTS = [str, str.lower, str.upper, lambda q: f"  {q.rstrip('?')}  "]
+
+
+async def run_wave(gemini, loop, executor, pipeline, students, questions):
+    def ask(i):
+        question = VARIANTS[i % len(VARIANTS)](QUESTIONS[i % questions])
+        messages = [{"role": "user", "content": question}]
+        try:
+            return pipeline.pipe(question, pipeline.model, messages, {"avatar_type": "mentor"})
+        except gemini.UpstreamUnavailable as e:
+            return f"Error: {e.status_code} {e.detail}"
+
+    start = time.perf_counter()
+    replies = await asyncio.gather(
+        *(loop.run_in_executor(executor, ask, i) for i in range(students))
+    )
+    return time.perf_counter() - start, replies
+
+
+async def stream_wave(loop, executor, pipeline, students, question):
+    """Stream `question` to every student at once; return (first fragment, total, text) each."""
+
+    def ask():
+        messages = [{"role": "user", "content": question}]
+        body = {"avatar_type": "mentor", "stream": True}
+        start = time.perf_counter()
+        first, fragments = None, []
+        for fragment in pipeline.pipe(question, pipeline.model, messages, body):
+            if first is None:
+                first = time.perf_counter() - start
+            fragments.append(fragment)
+        return first, time.perf_counter() - start, "".join(fragments)
+
+    return await asyncio.gather(*(loop.run_in_executor(executor, ask) for _ in range(students)))
+
+
+async def stream_scenarios(gemini, args, stub, loop, executor, pipeline):
+    """Run the fan-out and stall scenarios; return whether both passed, and their summaries."""
+    before = stub.requests
+    results = await stream_wave(loop, executor, pipeline, args.students, "Explain the chain rule")
+    firsts, totals, texts = zip(*results)
+    fan_out = (
+        stub.requests - before == 1
+        and len(set(texts)) == 1
+        and max(firsts) < min(totals) - args.chunk_interval
+    )
+    lines = [
+        f"{'PASS' if fan_out else 'FAIL'}  fan-out   upstream calls={stub.requests - before:<4} "
+        f"first fragment p50={statistics.median(firsts) * 1000:.0f}ms "
+        f"max={max(firsts) * 1000:.0f}ms, stream ends from {min(totals) * 1000:.0f}ms"
+    ]
+
+    # A leader that never streams anything nor completes
+    question = "Explain integration by parts"
+    key = gemini.ResponseCache.make_key("mentor", pipeline.model, question)
+    pipeline.response_cache.wait_timeout = args.wait
+    _, _, leader = pipeline.response_cache.begin(key)
+    before = stub.requests
+    timeouts = pipeline.response_cache.timeouts
+    try:
+        results = await stream_wave(loop, executor, pipeline, args.students, question)
+    finally:
+        pipeline.response_cache.complete(key, None)
+    firsts, totals, texts = zip(*results)
+    stall = (
+        leader
+        and stub.requests - before == args.students
+        and pipeline.response_cache.timeouts - timeouts == args.students
+        and all(json.loads(text)["response"] for text in texts)
+        and max(firsts) < args.wait + args.latency * 3
+    )
+    lines.append(
+        f"{'PASS' if stall else 'FAIL'}  stall     upstream calls={stub.requests - before:<4} "
+        f"timeouts={pipeline.response_cache.timeouts - timeouts} "
+        f"first fragment max={max(firsts) * 1000:.0f}ms (wait {args.wait * 1000:.0f}ms)"
+    )
+    return fan_out and stall, lines
+
+
+async def run_mode(gemini, args, cache):
+    stub = GeminiStub(latency=args.latency, chunk_interval=args.chunk_interval)
+    base_url = await stub.start()
+
+    pipeline = await make_pipeline(GEMINI_API_BASE_URL=base_url, GEMINI_RESPONSE_CACHE=cache)
+
+    loop = asyncio.get_running_loop()
+    waves = []
+    streamed, lines = True, []
+    try:
+        with ThreadPoolExecutor(max_workers=args.students) as executor, quiet():
+            for _ in range(2):
+                waves.append(
+                    await run_wave(gemini, loop, executor, pipeline, args.students, args.questions)
+                )
+            requests = stub.requests
+            stats = pipeline.response_cache.stats() if cache else {}
+            if cache:
+                streamed, lines = await stream_scenarios(
+                    gemini, args, stub, loop, executor, pipeline
+                )
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    errors = sum(reply.startswith("Error") for _, replies in waves for reply in replies)
+    return requests, [elapsed for elapsed, _ in waves], stats, errors, (streamed, lines)
+
+
+async def run(args):
+    gemini = load_gemini_pipeline()
+    # The stall scenario warns once per student
+    logging.getLogger("avatar_backend").setLevel(logging.ERROR)
+
+    upstream, streamed = {}, True
+    for cache in (False, True):
+        requests, waves, stats, errors, (streamed, lines) = await run_mode(gemini, args, cache)
+        upstream[cache] = requests
+        print(
+            f"cache {'on ' if cache else 'off'}  upstream calls={requests:<4} "
+            f"wave 1={waves[0] * 1000:6.0f}ms  wave 2={waves[1] * 1000:6.0f}ms  "
+            f"errors={errors}"
+        )
+        if stats:
+            print(f"          {stats}")
+        for line in lines:
+            print(line)
+
+    return 0 if upstream[True] == args.questions and streamed else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=3, choices=range(1, len(QUESTIONS) + 1))
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--chunk-interval", type=float, default=0.05)
+    parser.add_argument(
+        "--wait", type=float, default=0.5, help="Cache wait timeout in the stall scenario"
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: time to first token of avatar replies, streamed and not.
+
+Starts the local Gemini stub with a fixed time to first chunk and a fixed
+interval between chunks, then calls pipe() without and with streaming. The
+non-streaming call shows nothing until the whole reply is generated; the
+streaming call's first fragment should arrive about one upstream
+time-to-first-chunk after the request. The streamed fragments are also
+checked to join into the stub's avatar JSON.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_streaming --latency 0.3 --chunk-interval 0.05
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from open_tutorai.benchmarks.gemini_stub import (
+    STUB_REPLY,
+    GeminiStub,
+    make_pipeline,
+    quiet,
+)
+
+
+def timed_pipe(pipeline, stream):
+    """Return (time to first output, total time, full text) for one pipe() call."""
+    messages = [{"role": "user", "content": "Explain the chain rule"}]
+    body = {"avatar_type": "mentor", "stream": stream}
+
+    start = time.perf_counter()
+    with quiet():
+        result = pipeline.pipe("Explain the chain rule", pipeline.model, messages, body)
+
+    if isinstance(result, str):
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed, result
+
+    first, fragments = None, []
+    for fragment in result:
+        if first is None:
+            first = time.perf_counter() - start
+        fragments.append(fragment)
+    return first, time.perf_counter() - start, "".join(fragments)
+
+
+async def run(args):
+    stub = GeminiStub(latency=args.latency, chunk_interval=args.chunk_interval)
+    base_url = await stub.start()
+
+    logging.getLogger("avatar_backend").setLevel(logging.WARNING)
+    pipeline = await make_pipeline(GEMINI_API_BASE_URL=base_url)
+
+    results = {}
+    try:
+        for stream in (False, True):
+            samples = [
+                await asyncio.to_thread(timed_pipe, pipeline, stream)
+                for _ in range(args.repeat)
+            ]
+            results[stream] = samples
+    finally:
+        await pipeline.on_shutdown()
+        await stub.stop()
+
+    for stream, samples in results.items():
+        name = "stream" if stream else "generateContent"
+        print(
+            f"{name:<16} first output={statistics.median(s[0] for s in samples) * 1000:7.0f}ms  "
+            f"complete={statistics.median(s[1] for s in samples) * 1000:7.0f}ms"
+        )
+    print(f"upstream time to first chunk: {args.latency * 1000:.0f}ms")
+
+    streamed = results[True][0][2]
+    if json.loads(streamed) != STUB_REPLY:
+        print(f"streamed reply does not match the stub's JSON: {streamed}")
+        return 1
+
+    ttft = statistics.median(s[0] for s in results[True])
+    return 0 if ttft <= args.latency * args.max_ratio else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--chunk-interval", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.5,
+        help="Fail if the streamed time to first output exceeds this multiple of --latency",
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
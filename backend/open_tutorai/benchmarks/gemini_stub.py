@@ -0,0 +1,339 @@
+"""
+Local stub of the Gemini generateContent API, and of the OpenAI-compatible
+and Ollama chat APIs.
+
+Answers POST /v1beta/models/<model>:generateContent with a canned avatar
+reply, and /<model>:streamGenerateContent?alt=sse with the same reply split
+into server-sent events. POST /v1/chat/completions and /api/chat answer the
+same reply in the OpenAI and Ollama formats, streamed when the request asks.
+The first chunk arrives after a fixed latency and each further chunk after a
+fixed interval; the non-streaming reply waits for all of them, as a real
+model does. Optionally the first chunk is delayed further in proportion to
+the request size, as prompt processing is upstream. POST /cachedContents
+creates a context cache that later requests can reference by name.
+
+Faults can be injected: a share of requests, the first N requests, or all
+of them during an outage fail with a chosen status, optionally with a
+Retry-After header.
+
+Replies report token usage as each API does, counting a token per 4 bytes
+of request body and of reply.
+
+Requests in flight, the size of each request body and the tokens reported
+are recorded so benchmarks can check how many calls the pipeline overlapped,
+how much it sent and what it was billed. Nothing leaves the machine.
+
+Usage:
+    python -m open_tutorai.benchmarks.gemini_stub --port 8089 --latency 0.5 \\
+        --chunk-interval 0.05
+
+Then point the pipeline at it with
+GEMINI_API_BASE_URL=http://127.0.0.1:8089/v1beta/models,
+OPENAI_API_BASE_URL=http://127.0.0.1:8089/v1 or
+OLLAMA_BASE_URL=http://127.0.0.1:8089.
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import random
+from pathlib import Path
+
+from aiohttp import web
+
+GEMINI_PIPELINE_PATH = Path(__file__).resolve().parents[1] / "config" / "gemini.py"
+
+STUB_REPLY = {
+    "response": "Hello! I'm excited to help you with any questions you might have today.",
+    "animation": {"facial_expression": 1, "head_movement": 1},
+    "glbAnimation": "talking_happy",
+    "glbAnimationCategory": "expression",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_gemini_pipeline():
+    """Import config/gemini.py by path, as the pipelines server does, once."""
+    spec = importlib.util.spec_from_file_location("gemini_pipeline", GEMINI_PIPELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def make_pipeline(**valves):
+    """A gemini.py Pipeline with the given valves set and applied."""
+    pipeline = load_gemini_pipeline().Pipeline()
+    for name, value in valves.items():
+        setattr(pipeline.valves, name, value)
+    await pipeline.on_valves_updated()
+    return pipeline
+
+
+def quiet():
+    """Silence what the pipeline prints on each call."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def candidate(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+def gemini_usage(prompt_tokens: int, response_tokens: int) -> dict:
+    return {
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": response_tokens,
+            "totalTokenCount": prompt_tokens + response_tokens,
+        }
+    }
+
+
+def openai_usage(prompt_tokens: int, response_tokens: int) -> dict:
+    return {
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": response_tokens,
+            "total_tokens": prompt_tokens + response_tokens,
+        }
+    }
+
+
+def ollama_done(prompt_tokens: int, response_tokens: int) -> dict:
+    return {
+        "message": {"role": "assistant", "content": ""},
+        "done": True,
+        "prompt_eval_count": prompt_tokens,
+        "eval_count": response_tokens,
+    }
+
+
+# Reply bodies, with the usage each API reports, and streamed events for each
+# API the stub speaks
+REPLIES = {
+    "gemini": lambda text, usage: {**candidate(text), **gemini_usage(*usage)},
+    "openai": lambda text, usage: {
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+        ],
+        **openai_usage(*usage),
+    },
+    "ollama": lambda text, usage: {
+        **ollama_done(*usage),
+        "message": {"role": "assistant", "content": text},
+    },
+}
+EVENTS = {
+    "gemini": lambda text: f"data: {json.dumps(candidate(text))}\r\n\r\n",
+    "openai": lambda text: "data: "
+    + json.dumps({"choices": [{"index": 0, "delta": {"content": text}}]})
+    + "\n\n",
+    "ollama": lambda text: json.dumps(
+        {"message": {"role": "assistant", "content": text}, "done": False}
+    )
+    + "\n",
+}
+# Sent after the last chunk; OpenAI only reports usage when asked to
+STREAM_END = {
+    "gemini": lambda usage, payload: "data: "
+    + json.dumps({**candidate(""), **gemini_usage(*usage)})
+    + "\r\n\r\n",
+    "openai": lambda usage, payload: (
+        "data: " + json.dumps({"choices": [], **openai_usage(*usage)}) + "\n\n"
+        if (payload.get("stream_options") or {}).get("include_usage")
+        else ""
+    )
+    + "data: [DONE]\n\n",
+    "ollama": lambda usage, payload: json.dumps(ollama_done(*usage)) + "\n",
+}
+
+
+class GeminiStub:
+    def __init__(
+        self,
+        latency: float = 0.5,
+        chunk_interval: float = 0.0,
+        chunk_size: int = 16,
+        reply: dict = STUB_REPLY,
+        latency_per_kb: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        retry_after: float = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.latency_per_kb = latency_per_kb
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        # Set to fail every request until cleared
+        self.outage = False
+        self.failures = 0
+        self._random = random.Random(seed)
+        self.chunk_interval = chunk_interval
+        # Gemini usually fences its JSON, which the pipeline has to cope with
+        text = f"```json\n{json.dumps(reply, indent=2)}\n```"
+        self.chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.reply_tokens = len(text) // 4 + 1
+        self.requests = 0
+        self.request_bytes = []
+        self.tokens_reported = 0
+        self.cached_contents = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Client address and port of every connection a request came in on
+        self.connections = set()
+        self._runner = None
+        self.base_url = None
+        self.openai_base_url = None
+        self.ollama_base_url = None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        return await self.answer(request, "gemini")
+
+    async def handle_openai(self, request: web.Request) -> web.StreamResponse:
+        return await self.answer(request, "openai")
+
+    async def handle_ollama(self, request: web.Request) -> web.StreamResponse:
+        return await self.answer(request, "ollama")
+
+    async def answer(self, request: web.Request, api: str) -> web.StreamResponse:
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            body = await request.read()
+            self.request_bytes.append(len(body))
+
+            if self.should_fail():
+                self.failures += 1
+                headers = {}
+                if self.retry_after is not None:
+                    headers["Retry-After"] = str(self.retry_after)
+                return web.json_response(
+                    {"error": {"code": self.fail_status, "message": "Injected fault"}},
+                    status=self.fail_status,
+                    headers=headers,
+                )
+
+            payload = json.loads(body)
+            cached = payload.get("cachedContent")
+            if cached is not None and cached not in self.cached_contents:
+                return web.json_response(
+                    {"error": {"code": 404, "message": f"{cached} not found"}}, status=404
+                )
+
+            latency = self.latency + self.latency_per_kb * len(body) / 1024
+            # Prompt tokens are counted as the request's bytes / 4
+            usage = (len(body) // 4 + 1, self.reply_tokens)
+            self.tokens_reported += sum(usage)
+            if api == "gemini":
+                stream = request.match_info["model_action"].endswith(":streamGenerateContent")
+            else:
+                stream = payload.get("stream", False)
+            if stream:
+                return await self.stream(request, latency, api, usage, payload)
+
+            await asyncio.sleep(latency + self.chunk_interval * (len(self.chunks) - 1))
+            return web.json_response(REPLIES[api]("".join(self.chunks), usage))
+        finally:
+            self.in_flight -= 1
+
+    def should_fail(self) -> bool:
+        if self.outage or self.requests <= self.fail_first:
+            return True
+        return self._random.random() < self.fail_rate
+
+    async def stream(
+        self, request: web.Request, latency: float, api: str, usage: tuple, payload: dict
+    ) -> web.StreamResponse:
+        content_type = "application/x-ndjson" if api == "ollama" else "text/event-stream"
+        response = web.StreamResponse(headers={"Content-Type": content_type})
+        await response.prepare(request)
+        await asyncio.sleep(latency)
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                await asyncio.sleep(self.chunk_interval)
+            await response.write(EVENTS[api](chunk).encode())
+        await response.write(STREAM_END[api](usage, payload).encode())
+        await response.write_eof()
+        return response
+
+    async def create_cached_content(self, request: web.Request) -> web.Response:
+        cached = await request.json()
+        name = f"cachedContents/stub-{len(self.cached_contents)}"
+        self.cached_contents[name] = cached
+        return web.json_response({"name": name, "model": cached.get("model")})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1beta/models/{model_action}", self.handle)
+        app.router.add_post("/v1beta/cachedContents", self.create_cached_content)
+        app.router.add_post("/v1/chat/completions", self.handle_openai)
+        app.router.add_post("/api/chat", self.handle_ollama)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on host:port (0 picks a free port) and return the API base URL."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}/v1beta/models"
+        self.openai_base_url = f"http://{host}:{port}/v1"
+        self.ollama_base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args):
+    stub = GeminiStub(
+        latency=args.latency,
+        chunk_interval=args.chunk_interval,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+        retry_after=args.retry_after,
+    )
+    base_url = await stub.start(args.host, args.port)
+    print(f"Gemini stub listening, GEMINI_API_BASE_URL={base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Seconds to the first chunk"
+    )
+    parser.add_argument(
+        "--chunk-interval", type=float, default=0.0, help="Seconds between chunks"
+    )
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="Share of requests that fail"
+    )
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument(
+        "--retry-after", type=float, default=None, help="Retry-After sent with failures"
+    )
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: event loop stalls from signup password hashing.
+
+A probe sleeps --interval on the event loop over and over and records how
+late it wakes up. That lateness is what every other request on the worker
+would wait. Against it:
+
+- inline:    --signups hashes called directly in async handlers, as signup
+             used to; the loop stalls for each whole hash
+- pool:      the same burst through PasswordHasher; the probe's p99 lag must
+             stay under --max-lag-ms
+- admission: a burst larger than the pool's workers and queue; the excess is
+             turned away with a 503 and a Retry-After at once, and the
+             metrics add up
+
+Hashes use bcrypt at --rounds when it is installed, and otherwise PBKDF2
+from hashlib, sized to take about as long. Like bcrypt, it releases the GIL
+while it runs.
+
+Usage:
+    python -m open_tutorai.benchmarks.password_hashing --signups 40 --workers 2
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+
+from fastapi import HTTPException
+
+from open_tutorai.benchmarks.supports_load import percentile
+from open_tutorai.utils.hashing import PasswordHasher
+
+
+def make_hash_fn(args):
+    """A password hash function, and a description of it."""
+    try:
+        import bcrypt
+    except ImportError:
+        iterations = 100_000
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac("sha256", b"password", os.urandom(16), iterations)
+        iterations = int(iterations * args.hash_ms / 1000 / (time.perf_counter() - start))
+
+        def hash_fn(password):
+            salt = os.urandom(16)
+            return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations).hex()
+
+        return hash_fn, f"PBKDF2-SHA256 x{iterations:,} (bcrypt not installed)"
+
+    def hash_fn(password):
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(args.rounds)).decode()
+
+    return hash_fn, f"bcrypt, {args.rounds} rounds"
+
+
+async def probe(stop, interval):
+    """Seconds the loop woke up late, once per `interval`, until `stop` is set."""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+async def under_probe(burst, interval):
+    """Run `burst()` while probing; return (its result, lags, seconds)."""
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(stop, interval))
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    result = await burst()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return result, await prober, elapsed
+
+
+def lag_summary(lags):
+    return (
+        f"loop lag p50 {percentile(lags, 50) * 1000:.1f}ms, "
+        f"p99 {percentile(lags, 99) * 1000:.1f}ms, max {max(lags) * 1000:.1f}ms"
+    )
+
+
+async def inline(args, hash_fn):
+    async def signup(n):
+        return hash_fn(f"password-{n}")
+
+    async def burst():
+        return await asyncio.gather(*(signup(n) for n in range(args.signups)))
+
+    hashes, lags, elapsed = await under_probe(burst, args.interval)
+    return (
+        len(hashes) == args.signups,
+        f"{args.signups} hashes in {elapsed:.2f}s; {lag_summary(lags)}",
+    )
+
+
+async def pool(args, hash_fn):
+    hasher = PasswordHasher(hash_fn, args.workers, args.signups)
+
+    async def burst():
+        return await asyncio.gather(
+            *(hasher.hash(f"password-{n}") for n in range(args.signups))
+        )
+
+    hashes, lags, elapsed = await under_probe(burst, args.interval)
+    metrics = hasher.snapshot()
+    return (
+        len(hashes) == args.signups
+        and metrics["completed"] == args.signups
+        and percentile(lags, 99) * 1000 <= args.max_lag_ms,
+        f"{args.signups} hashes in {elapsed:.2f}s on {args.workers} workers; "
+        f"{lag_summary(lags)}; queue depth max {metrics['queue_depth_max']}, "
+        f"wait avg {metrics['queue_wait_avg_ms']:.0f}ms",
+    )
+
+
+async def admission(args, hash_fn):
+    hasher = PasswordHasher(hash_fn, args.workers, args.max_queue)
+    capacity = args.workers + args.max_queue
+    rejected_in = []
+
+    async def signup(n):
+        start = time.perf_counter()
+        try:
+            await hasher.hash(f"password-{n}")
+            return 200
+        except HTTPException as e:
+            rejected_in.append(time.perf_counter() - start)
+            return (e.status_code, e.headers.get("Retry-After"))
+
+    statuses = await asyncio.gather(*(signup(n) for n in range(capacity * 2)))
+    rejections = [status for status in statuses if status != 200]
+    metrics = hasher.snapshot()
+    return (
+        statuses.count(200) == capacity
+        and all(code == 503 and retry_after for code, retry_after in rejections)
+        and max(rejected_in) < 0.01
+        and metrics["rejected"] == len(rejections)
+        and metrics["submitted"] == metrics["completed"] == capacity
+        and metrics["running"] == metrics["queued"] == 0,
+        f"{capacity * 2} signups at once for {args.workers} workers + {args.max_queue} queued: "
+        f"{statuses.count(200)} hashed, {len(rejections)} got 503 in "
+        f"{max(rejected_in, default=0) * 1000:.2f}ms max "
+        f"(Retry-After {rejections[0][1] if rejections else '-'}s)",
+    )
+
+
+SCENARIOS = {"inline": inline, "pool": pool, "admission": admission}
+
+
+async def run(args):
+    hash_fn, description = make_hash_fn(args)
+    start = time.perf_counter()
+    hash_fn("password")
+    print(f"hash: {description}, {(time.perf_counter() - start) * 1000:.0f}ms each")
+
+    failed = 0
+    for name, scenario in SCENARIOS.items():
+        passed, summary = await scenario(args, hash_fn)
+        failed += not passed
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<10} {summary}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signups", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-queue", type=int, default=8, help="Queue in the admission scenario")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument(
+        "--hash-ms", type=float, default=150.0, help="Target time of the PBKDF2 stand-in"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.01, help="Seconds between loop probes"
+    )
+    parser.add_argument(
+        "--max-lag-ms", type=float, default=50.0, help="Allowed loop lag p99 with the pool"
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
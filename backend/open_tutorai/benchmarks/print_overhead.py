@@ -0,0 +1,133 @@
+"""
+Benchmark: what the WebUI banner suppression costs every print call.
+
+- suppression: inside webui_banner_suppressed() the banner is dropped and
+               other output printed as usual; after it builtins.print is the
+               interpreter's own again
+- overhead:    print-heavy loops (one string, several arguments, objects
+               with a __str__) timed with the native print, with the global
+               wrapper patches.py used to install for the whole process, and
+               with print as it is after startup; the last must be within
+               --tolerance of native
+
+Output goes to a stream that discards it, so the timings are the cost of
+print itself.
+
+Usage:
+    python -m open_tutorai.benchmarks.print_overhead --calls 50000 --repeats 7
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import os
+import time
+
+from open_tutorai import patches
+
+NATIVE_PRINT = builtins.print
+
+
+def legacy_print(*args, **kwargs):
+    """The wrapper that used to replace print in every worker."""
+    output = " ".join(str(arg) for arg in args)
+    if patches.WEBUI_SIGNATURE_LINE in output:
+        if os.environ.get("SUPPRESS_WEBUI_BANNER") == "true":
+            return
+    return NATIVE_PRINT(*args, **kwargs)
+
+
+class Discard(io.TextIOBase):
+    def write(self, text):
+        return len(text)
+
+
+class Lesson:
+    def __init__(self, number):
+        self.number = number
+
+    def __str__(self):
+        return f"Lesson {self.number}"
+
+
+WORKLOADS = {
+    "one string": lambda i: builtins.print("Support database tables initialized successfully"),
+    "several args": lambda i: builtins.print("request", i, "took", 0.25, "ms"),
+    "objects": lambda i: builtins.print(Lesson(i), Lesson(i + 1)),
+}
+
+
+def time_prints(workload, calls):
+    """Seconds per call of `workload` with stdout discarded."""
+    with contextlib.redirect_stdout(Discard()):
+        start = time.perf_counter()
+        for i in range(calls):
+            workload(i)
+        return (time.perf_counter() - start) / calls
+
+
+def suppression(args):
+    os.environ["SUPPRESS_WEBUI_BANNER"] = "true"
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        with patches.webui_banner_suppressed():
+            wrapped = builtins.print is not NATIVE_PRINT
+            print(patches.WEBUI_SIGNATURE_LINE + "v0.5.0 - building the best AI user interface.")
+            print("Support database tables initialized successfully")
+    lines = output.getvalue().splitlines()
+    restored = builtins.print is NATIVE_PRINT
+    return (
+        wrapped and restored and lines == ["Support database tables initialized successfully"],
+        f"banner {'printed' if len(lines) > 1 else 'suppressed'}, "
+        f"{len(lines)} line(s) printed, print {'restored' if restored else 'STILL WRAPPED'} after",
+    )
+
+
+def overhead(args):
+    passed = True
+    summaries = []
+    for name, workload in WORKLOADS.items():
+        # Interleaved and the best of each kept, so drift hits all three alike
+        native = legacy = now = float("inf")
+        for _ in range(args.repeats):
+            native = min(native, time_prints(workload, args.calls))
+            builtins.print = legacy_print
+            try:
+                legacy = min(legacy, time_prints(workload, args.calls))
+            finally:
+                builtins.print = NATIVE_PRINT
+            with patches.webui_banner_suppressed():
+                pass
+            now = min(now, time_prints(workload, args.calls))
+        passed &= now <= native * (1 + args.tolerance)
+        summaries.append(
+            f"{name}: native {native * 1e9:.0f}ns, wrapped {legacy * 1e9:.0f}ns, "
+            f"now {now * 1e9:.0f}ns ({now / native - 1:+.0%})"
+        )
+    return passed, "; ".join(summaries)
+
+
+SCENARIOS = {"suppression": suppression, "overhead": overhead}
+
+
+def run(args):
+    failed = 0
+    for name, scenario in SCENARIOS.items():
+        passed, summary = scenario(args)
+        failed += not passed
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<12} {summary}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50000, help="Prints per timing")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Allowed slowdown against native print"
+    )
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
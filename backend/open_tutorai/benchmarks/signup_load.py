@@ -0,0 +1,172 @@
+"""
+Load test: a class signing up at once through /auths/signup.
+
+Sends --students signups, with --concurrency in flight at a time, as a class
+onboarding in a minute would, while two routes are probed at a fixed rate:
+POST /tutorai/health, which shows event loop stalls, and GET
+/auths/user-count, which checks a connection out of the database pool and
+so shows signups holding on to pooled connections. Reports the signup
+latency and throughput, the latency of both probes during the burst against
+an idle server, and the statuses returned. It also
+checks that GET /auths/user-count grew by the number of accounts created.
+
+Every run creates real accounts ("<prefix>-<run>-<n>@example.com"), so point
+it at a test instance. The instance must already have its admin.
+
+Usage:
+    python -m open_tutorai.benchmarks.signup_load \\
+        --base-url http://localhost:8080 --students 300 --concurrency 30
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+
+from open_tutorai.benchmarks.supports_load import percentile, probe_health, summarize
+
+
+async def user_count(session, base_url):
+    async with session.get(f"{base_url}/auths/user-count") as response:
+        return (await response.json())["count"]
+
+
+async def probe_pooled(session, base_url, duration, interval, statuses):
+    """Like probe_health, on a route that takes a pooled database session."""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        async with session.get(f"{base_url}/auths/user-count") as response:
+            await response.read()
+            statuses[response.status] += 1
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    return latencies
+
+
+async def probe_both(session, args, duration, pooled_statuses):
+    return await asyncio.gather(
+        probe_health(session, args.base_url, duration, args.interval),
+        probe_pooled(session, args.base_url, duration, args.interval, pooled_statuses),
+    )
+
+
+def ratio(loaded, idle, floor):
+    """Burst p99 over idle p99, the latter raised to `floor` seconds."""
+    return percentile(loaded, 99) / max(percentile(idle, 99), floor)
+
+
+async def sign_up(session, base_url, email, latencies, statuses):
+    form = {"name": email.split("@")[0], "email": email, "password": "load-test-password"}
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{base_url}/auths/signup", json=form) as response:
+            await response.read()
+            statuses[response.status] += 1
+    except aiohttp.ClientError as e:
+        statuses[type(e).__name__] += 1
+    latencies.append(time.perf_counter() - start)
+
+
+async def burst(session, args, latencies, statuses):
+    run_id = uuid.uuid4().hex[:8]
+    emails = iter(
+        f"{args.prefix}-{run_id}-{n}@example.com" for n in range(args.students)
+    )
+
+    async def student():
+        for email in emails:
+            await sign_up(session, args.base_url, email, latencies, statuses)
+
+    await asyncio.gather(*(student() for _ in range(args.concurrency)))
+
+
+async def run(args):
+    connector = aiohttp.TCPConnector(limit=args.concurrency + 6)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        if await user_count(session, args.base_url) == 0:
+            print("No users yet; sign up the admin first")
+            return 1
+
+        print(f"Measuring idle probe latency for {args.idle}s...")
+        pooled_statuses = Counter()
+        idle, idle_pooled = await probe_both(session, args, args.idle, pooled_statuses)
+
+        print(f"Signing up {args.students} students, {args.concurrency} at a time...")
+        before = await user_count(session, args.base_url)
+        latencies, statuses = [], Counter()
+        start = time.perf_counter()
+        signups = asyncio.create_task(burst(session, args, latencies, statuses))
+        loaded, loaded_pooled = [], []
+        while not signups.done():
+            health, pooled = await probe_both(session, args, args.interval, pooled_statuses)
+            loaded += health
+            loaded_pooled += pooled
+        await signups
+        elapsed = time.perf_counter() - start
+        after = await user_count(session, args.base_url)
+
+    print()
+    print(summarize("health (idle)", idle))
+    print(summarize("health (signup burst)", loaded))
+    print(summarize("user-count (idle)", idle_pooled))
+    print(summarize("user-count (burst)", loaded_pooled))
+    print(summarize("auths/signup", latencies))
+    print(
+        f"\n{args.students} signups in {elapsed:.1f}s ({args.students / elapsed:.1f}/s); "
+        f"statuses: {', '.join(f'{status}: {n}' for status, n in sorted(statuses.items(), key=str))}"
+    )
+    print(f"user count {before} -> {after} (+{after - before})")
+
+    failed = args.students - statuses[200]
+    pooled_failed = sum(n for status, n in pooled_statuses.items() if status != 200)
+    floor = args.min_p99_ms / 1000
+    health_ratio = ratio(loaded, idle, floor)
+    pooled_ratio = ratio(loaded_pooled, idle_pooled, floor)
+    print(f"health p99 during the burst / idle: {health_ratio:.2f}x")
+    print(
+        f"user-count p99 during the burst / idle: {pooled_ratio:.2f}x, "
+        f"{pooled_failed} probes failed"
+    )
+    return (
+        0
+        if not failed
+        and not pooled_failed
+        and after - before == statuses[200]
+        and max(health_ratio, pooled_ratio) <= args.max_ratio
+        else 1
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--prefix", default="loadtest", help="Local part of the emails")
+    parser.add_argument(
+        "--idle", type=float, default=5.0, help="Seconds of idle probing"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.05, help="Seconds between probes"
+    )
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=3.0,
+        help="Fail if either probe's p99 during the burst exceeds this multiple of idle p99",
+    )
+    parser.add_argument(
+        "--min-p99-ms",
+        type=float,
+        default=10.0,
+        help="Idle p99 below this is taken as this, so jitter on a fast route does not fail",
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
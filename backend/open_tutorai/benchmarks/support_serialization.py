@@ -0,0 +1,154 @@
+"""
+Microbenchmark: serializing a page of supports to a JSON response body.
+
+Compares the previous path (a hand-built dict per support with isoformat()
+dates, run through FastAPI's jsonable_encoder and json.dumps as JSONResponse
+does) against the compiled serializer with orjson used by the supports
+router now. Rows are synthetic, so no database or server is needed.
+
+Usage:
+    python -m open_tutorai.benchmarks.support_serialization [--rows 10000]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from open_tutorai.utils.serializers import compile_support_serializer
+
+FIELDS = (
+    "id",
+    "user_id",
+    "title",
+    "short_description",
+    "subject",
+    "custom_subject",
+    "course_id",
+    "learning_objective",
+    "learning_type",
+    "level",
+    "content_language",
+    "estimated_duration",
+    "access_type",
+    "keywords",
+    "start_date",
+    "end_date",
+    "avatar_id",
+    "status",
+    "chat_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def make_rows(count):
+    now = datetime.now()
+    rows, keywords = [], {}
+    for i in range(count):
+        support_id = f"support-{i:06d}"
+        rows.append(
+            SimpleNamespace(
+                id=support_id,
+                user_id="user-1",
+                title=f"Support request {i}",
+                short_description="Help with derivatives and the chain rule",
+                subject="Mathematics",
+                custom_subject=None,
+                course_id=None,
+                learning_objective="Differentiate composite functions",
+                learning_type="Exercises",
+                level="Intermediate",
+                content_language="English",
+                estimated_duration="1h",
+                access_type="Private",
+                start_date="2025-01-01",
+                end_date=None,
+                avatar_id="avatar-1",
+                status="pending",
+                chat_id=None,
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+            )
+        )
+        keywords[support_id] = ["calculus", "derivatives"]
+    return rows, keywords
+
+
+def encode_before(rows, keywords):
+    items = [
+        {
+            "id": row.id,
+            "user_id": row.user_id,
+            "title": row.title,
+            "short_description": row.short_description,
+            "subject": row.subject,
+            "custom_subject": row.custom_subject,
+            "course_id": row.course_id,
+            "learning_objective": row.learning_objective,
+            "learning_type": row.learning_type,
+            "level": row.level,
+            "content_language": row.content_language,
+            "estimated_duration": row.estimated_duration,
+            "access_type": row.access_type,
+            "keywords": keywords.get(row.id) or None,
+            "start_date": row.start_date,
+            "end_date": row.end_date,
+            "avatar_id": row.avatar_id,
+            "status": row.status,
+            "chat_id": row.chat_id,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+        for row in rows
+    ]
+    # What JSONResponse does with a returned value
+    return json.dumps(
+        jsonable_encoder(items),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def encode_after(rows, keywords):
+    return orjson.dumps(compile_support_serializer(FIELDS)(rows, keywords))
+
+
+def measure(fn, rows, keywords, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows, keywords)
+        timings.append(time.perf_counter() - start)
+    return min(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows, keywords = make_rows(args.rows)
+
+    before, before_body = measure(encode_before, rows, keywords, args.repeat)
+    after, after_body = measure(encode_after, rows, keywords, args.repeat)
+
+    if json.loads(before_body) != json.loads(after_body):
+        raise SystemExit("Serializers disagree on the response body")
+
+    for name, seconds in (("before (jsonable_encoder)", before), ("after (orjson)", after)):
+        print(
+            f"{name:<26} {seconds * 1000:8.2f}ms  "
+            f"{args.rows / seconds:12,.0f} rows/s"
+        )
+    print(f"\nspeedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Load test: event loop responsiveness while /supports/list is hammered.
+
+Probes POST /tutorai/health at a fixed rate, first on an idle server and then
+while a pool of clients hammers GET /api/v1/supports/list. If database access
+blocks the event loop, the health p99 under load climbs with the list latency;
+with the database work on its own executor it should stay flat.
+
+Usage:
+    python -m open_tutorai.benchmarks.supports_load \\
+        --base-url http://localhost:8080 --token <JWT> --duration 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name, samples):
+    samples_ms = [s * 1000 for s in samples]
+    return (
+        f"{name:<24} n={len(samples_ms):<6} "
+        f"p50={percentile(samples_ms, 50):8.2f}ms "
+        f"p99={percentile(samples_ms, 99):8.2f}ms "
+        f"mean={statistics.fmean(samples_ms) if samples_ms else 0.0:8.2f}ms"
+    )
+
+
+async def probe_health(session, base_url, duration, interval):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        async with session.post(f"{base_url}/tutorai/health") as response:
+            await response.read()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    return latencies
+
+
+async def hammer_list(session, base_url, headers, stop, latencies, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            async with session.get(
+                f"{base_url}/api/v1/supports/list", headers=headers
+            ) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    headers = {"Authorization": f"Bearer {args.token}"}
+    connector = aiohttp.TCPConnector(limit=args.concurrency + 4)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        print(f"Measuring idle health latency for {args.duration}s...")
+        idle = await probe_health(session, args.base_url, args.duration, args.interval)
+
+        print(
+            f"Measuring health latency with {args.concurrency} clients "
+            f"hammering /supports/list for {args.duration}s..."
+        )
+        stop = asyncio.Event()
+        list_latencies, errors = [], []
+        hammers = [
+            asyncio.create_task(
+                hammer_list(
+                    session, args.base_url, headers, stop, list_latencies, errors
+                )
+            )
+            for _ in range(args.concurrency)
+        ]
+        loaded = await probe_health(
+            session, args.base_url, args.duration, args.interval
+        )
+        stop.set()
+        await asyncio.gather(*hammers)
+
+    print()
+    print(summarize("health (idle)", idle))
+    print(summarize("health (under load)", loaded))
+    print(summarize("supports/list", list_latencies))
+    if errors:
+        print(f"supports/list errors: {len(errors)} (first: {errors[0]})")
+
+    idle_p99 = percentile(idle, 99)
+    loaded_p99 = percentile(loaded, 99)
+    ratio = loaded_p99 / idle_p99 if idle_p99 else float("inf")
+    print(f"\nhealth p99 under load / idle: {ratio:.2f}x")
+    return 0 if ratio <= args.max_ratio else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--token", required=True, help="JWT of a verified user")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--interval", type=float, default=0.05, help="Seconds between health probes"
+    )
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=3.0,
+        help="Fail if health p99 under load exceeds this multiple of idle p99",
+    )
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,16 @@ from open_tutorai.env import (
     ENABLE_LOGIN_FORM,
     JWT_EXPIRES_IN,
     WEBHOOK_URL,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_MAX_OVERFLOW,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_EXECUTOR_WORKERS,
+    SUPPORT_UPLOAD_MAX_SIZE,
+    USER_COUNT_CACHE_TTL,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE,
 )
 from pydantic import BaseModel
 from typing import Optional
@@ -14,3 +24,13 @@ class AppConfig(BaseModel):
     JWT_EXPIRES_IN: str = JWT_EXPIRES_IN
     WEBHOOK_URL: Optional[str] = WEBHOOK_URL
     USER_PERMISSIONS: dict = {}
+    DATABASE_POOL_SIZE: int = DATABASE_POOL_SIZE
+    DATABASE_POOL_MAX_OVERFLOW: int = DATABASE_POOL_MAX_OVERFLOW
+    DATABASE_POOL_TIMEOUT: int = DATABASE_POOL_TIMEOUT
+    DATABASE_POOL_RECYCLE: int = DATABASE_POOL_RECYCLE
+    DATABASE_POOL_PRE_PING: bool = DATABASE_POOL_PRE_PING
+    DATABASE_EXECUTOR_WORKERS: int = DATABASE_EXECUTOR_WORKERS
+    SUPPORT_UPLOAD_MAX_SIZE: int = SUPPORT_UPLOAD_MAX_SIZE
+    USER_COUNT_CACHE_TTL: int = USER_COUNT_CACHE_TTL
+    PASSWORD_HASH_WORKERS: int = PASSWORD_HASH_WORKERS
+    PASSWORD_HASH_MAX_QUEUE: int = PASSWORD_HASH_MAX_QUEUE
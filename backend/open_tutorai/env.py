@@ -1,8 +1,5 @@
 import os
-import pkgutil
 from pathlib import Path
-import markdown
-from bs4 import BeautifulSoup
 
 ENABLE_SIGNUP = True
 ENABLE_LOGIN_FORM = True
@@ -36,63 +33,68 @@ else:
 VERSION = PACKAGE_DATA["version"]
 
 
-# Function to parse each section
-def parse_section(section):
-    items = []
-    for li in section.find_all("li"):
-        # Extract raw HTML string
-        raw_html = str(li)
-
-        # Extract text without HTML tags
-        text = li.get_text(separator=" ", strip=True)
-
-        # Split into title and content
-        parts = text.split(": ", 1)
-        title = parts[0].strip() if len(parts) > 1 else ""
-        content = parts[1].strip() if len(parts) > 1 else text
-
-        items.append({"title": title, "content": content, "raw": raw_html})
-    return items
-
-
-try:
-    changelog_path = BASE_DIR / "CHANGELOG.md"
-    with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
-        changelog_content = file.read()
+####################################
+# DATABASE
+####################################
 
-except Exception:
-    changelog_content = (pkgutil.get_data("open_tutorai", "CHANGELOG.md") or b"").decode()
+DATABASE_POOL_SIZE = int(os.environ.get("TUTORAI_DATABASE_POOL_SIZE", "10"))
+DATABASE_POOL_MAX_OVERFLOW = int(
+    os.environ.get("TUTORAI_DATABASE_POOL_MAX_OVERFLOW", "10")
+)
+DATABASE_POOL_TIMEOUT = int(os.environ.get("TUTORAI_DATABASE_POOL_TIMEOUT", "10"))
+DATABASE_POOL_RECYCLE = int(os.environ.get("TUTORAI_DATABASE_POOL_RECYCLE", "3600"))
+DATABASE_POOL_PRE_PING = (
+    os.environ.get("TUTORAI_DATABASE_POOL_PRE_PING", "True").lower() == "true"
+)
+
+# Worker threads used to run blocking database calls off the event loop. By
+# default one per pooled connection, so workers never queue on the pool.
+DATABASE_EXECUTOR_WORKERS = int(
+    os.environ.get(
+        "TUTORAI_DATABASE_EXECUTOR_WORKERS",
+        str(DATABASE_POOL_SIZE + DATABASE_POOL_MAX_OVERFLOW),
+    )
+)
 
 
-# Convert markdown content to HTML
-html_content = markdown.markdown(changelog_content)
+####################################
+# AUTH
+####################################
 
-# Parse the HTML content
-soup = BeautifulSoup(html_content, "html.parser")
+# Seconds the user count is cached for by the signup path. Signups made by
+# this worker update it; users added or removed elsewhere show up on expiry.
+USER_COUNT_CACHE_TTL = int(os.environ.get("TUTORAI_USER_COUNT_CACHE_TTL", "60"))
 
-# Initialize JSON structure
-changelog_json = {}
+# Threads hashing signup passwords, and how many more signups may wait for
+# one before further signups are turned away with a 503
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get("TUTORAI_PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("TUTORAI_PASSWORD_HASH_MAX_QUEUE", "32"))
 
-# Iterate over each version
-for version in soup.find_all("h2"):
-    version_number = version.get_text().strip().split(" - ")[0][1:-1]  # Remove brackets
-    date = version.get_text().strip().split(" - ")[1]
 
-    version_data = {"date": date}
+####################################
+# UPLOADS
+####################################
 
-    # Find the next sibling that is a h3 tag (section title)
-    current = version.find_next_sibling()
+SUPPORT_UPLOAD_DIR = os.environ.get("TUTORAI_SUPPORT_UPLOAD_DIR", "data/uploads")
 
-    while current and current.name != "h2":
-        if current.name == "h3":
-            section_title = current.get_text().lower()  # e.g., "added", "fixed"
-            section_items = parse_section(current.find_next_sibling("ul"))
-            version_data[section_title] = section_items
+# Maximum size in bytes of a single support file upload (default 512 MiB)
+SUPPORT_UPLOAD_MAX_SIZE = int(
+    os.environ.get("TUTORAI_SUPPORT_UPLOAD_MAX_SIZE", str(512 * 1024 * 1024))
+)
 
-        # Move to the next element
-        current = current.find_next_sibling()
+# When support files are served behind nginx, set this to an `internal`
+# location aliased to SUPPORT_UPLOAD_DIR to let nginx stream them
+SUPPORT_FILE_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    "TUTORAI_SUPPORT_FILE_ACCEL_REDIRECT_PREFIX", ""
+)
 
-    changelog_json[version_number] = version_data
 
+def __getattr__(name):
+    # The changelog is loaded on first use rather than parsed at import
+    if name == "CHANGELOG":
+        from open_tutorai.utils.changelog import load_changelog
 
-CHANGELOG = changelog_json
\ No newline at end of file
+        return load_changelog()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
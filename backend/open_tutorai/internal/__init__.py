@@ -0,0 +1 @@
+# OpenTutorAI internal initialization
@@ -0,0 +1,170 @@
+"""
+Database session layer for OpenTutorAI
+
+OpenTutorAI tables live in the same database as OpenWebUI. The routers use a
+dedicated, explicitly sized connection pool on that database so pool pressure
+can be tuned and observed independently from OpenWebUI's own engine.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from open_webui.env import DATABASE_URL
+from open_tutorai.env import (
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_MAX_OVERFLOW,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_EXECUTOR_WORKERS,
+)
+
+log = logging.getLogger(__name__)
+
+connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=QueuePool,
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+    pool_timeout=DATABASE_POOL_TIMEOUT,
+    pool_recycle=DATABASE_POOL_RECYCLE,
+    pool_pre_ping=DATABASE_POOL_PRE_PING,
+    connect_args=connect_args,
+)
+
+SessionLocal = sessionmaker(
+    bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
+)
+
+
+class PoolMetrics:
+    """Thread-safe counters describing how requests wait on the connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.executor_pending = 0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def executor_enter(self):
+        with self._lock:
+            self.executor_pending += 1
+
+    def executor_exit(self):
+        with self._lock:
+            self.executor_pending -= 1
+
+    def snapshot(self) -> dict:
+        pool = engine.pool
+        with self._lock:
+            avg_wait = self.wait_time_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": DATABASE_POOL_MAX_OVERFLOW,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": round(avg_wait * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "executor_workers": DATABASE_EXECUTOR_WORKERS,
+                "executor_pending": self.executor_pending,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+def open_session():
+    """
+    A session from the shared pool with its connection already checked out,
+    so the time spent waiting on the pool is measured, and an exhausted pool
+    surfaces as a 503 instead of a slow request. The caller closes it.
+    """
+    session = SessionLocal()
+    start = time.perf_counter()
+    try:
+        session.connection()
+    except PoolTimeoutError:
+        session.close()
+        pool_metrics.record_timeout()
+        log.error(
+            f"Database pool exhausted after {DATABASE_POOL_TIMEOUT}s "
+            f"(size={DATABASE_POOL_SIZE}, max_overflow={DATABASE_POOL_MAX_OVERFLOW})"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection pool exhausted, please retry shortly",
+        )
+    pool_metrics.record_wait(time.perf_counter() - start)
+    return session
+
+
+def get_session():
+    """FastAPI dependency yielding a request-scoped session from the shared pool."""
+    session = open_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# Blocking SQLAlchemy calls run here instead of on the event loop. The worker
+# count is the concurrency limit for database work issued by the routers.
+db_executor = ThreadPoolExecutor(
+    max_workers=DATABASE_EXECUTOR_WORKERS, thread_name_prefix="tutorai-db"
+)
+
+
+async def run_in_db_executor(fn, *args, **kwargs):
+    """Run a blocking database call on the bounded database executor."""
+    loop = asyncio.get_running_loop()
+    pool_metrics.executor_enter()
+    try:
+        return await loop.run_in_executor(
+            db_executor, functools.partial(fn, *args, **kwargs)
+        )
+    finally:
+        pool_metrics.executor_exit()
+
+
+def _call_with_session(fn, *args, **kwargs):
+    session = open_session()
+    try:
+        return fn(session, *args, **kwargs)
+    finally:
+        session.close()
+
+
+async def run_with_session(fn, *args, **kwargs):
+    """
+    Run `fn(db, *args, **kwargs)` on the database executor with a session of
+    its own, holding a pooled connection only for that call. For routes that
+    also await slow work of another kind, during which a request-scoped
+    session would keep its connection checked out for nothing.
+    """
+    return await run_in_db_executor(_call_with_session, fn, *args, **kwargs)
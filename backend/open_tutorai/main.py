@@ -1,13 +1,20 @@
 import os
 os.environ["SUPPRESS_WEBUI_BANNER"] = "true"
-import open_tutorai.patches
-from fastapi import FastAPI
+from open_tutorai.patches import webui_banner_suppressed
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from open_webui.main import app as webui_app
+from fastapi.responses import Response
+
+with webui_banner_suppressed():
+    from open_webui.main import app as webui_app
+
 from open_webui.config import CORS_ALLOW_ORIGIN
-from open_webui.models.users import Users
+from open_webui.utils.auth import get_admin_user
 from open_tutorai.config import AppConfig
 from open_tutorai.models.database import init_database
+from open_tutorai.internal.db import pool_metrics
+from open_tutorai.utils.changelog import changelog_response
+from open_tutorai.utils.uploads import UploadSizeLimitMiddleware
 
 from open_tutorai.routers import (
     response_feedbacks,
@@ -15,10 +22,6 @@ from open_tutorai.routers import (
     supports
 )
 
-from open_tutorai.env import (
-    CHANGELOG,
-)
-
 # Version info
 VERSION = "1.0.0"
 TUTORAI_BUILD_HASH = os.getenv("TUTORAI_BUILD_HASH", "dev-build")
@@ -45,6 +48,14 @@ app = FastAPI(
     version=VERSION,
 )
 
+# Turn away oversized uploads while they arrive; added first so CORS
+# headers still wrap the 413
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/api/v1/supports/upload-file"],
+    max_size=lambda: app.state.config.SUPPORT_UPLOAD_MAX_SIZE,
+)
+
 # Handle wildcard origin with credentials by reflecting request origin
 origins = CORS_ALLOW_ORIGIN
 allow_origin_regex = None
@@ -58,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 app.state.config = AppConfig()
 # app.state.USER_COUNT = 10
@@ -79,14 +91,32 @@ async def health_check():
     return {"status": "okay"}
 
 
+# Database pool metrics endpoint
+@app.get("/tutorai/db/pool")
+async def db_pool_metrics(user=Depends(get_admin_user)):
+    return pool_metrics.snapshot()
+
+
+# Signup password hashing pool metrics endpoint
+@app.get("/tutorai/auth/hashing")
+async def password_hashing_metrics(user=Depends(get_admin_user)):
+    return auths.password_hasher.snapshot()
+
+
 # Include routers of open_tutorai
 app.include_router(response_feedbacks.router, prefix="/api/v1", tags=["response-feedbacks"])
 app.include_router(auths.router, prefix="/auths", tags=["auths"])
 app.include_router(supports.router, prefix="/api/v1", tags=["supports"])
 
 @app.get("/api/changelog")
-async def get_app_changelog():
-    return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
+async def get_app_changelog(request: Request):
+    # Built once per process from the changelog compiled at build time
+    body, etag = changelog_response()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 # Mount the entire OpenWebUI app
 app.mount("/", webui_app)
\ No newline at end of file
@@ -0,0 +1 @@
+# OpenTutorAI data migrations
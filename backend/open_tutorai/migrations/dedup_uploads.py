@@ -0,0 +1,126 @@
+"""
+Move existing support uploads into the content-addressed blob store.
+
+Every SupportFile row that still points at a per-upload file is hashed,
+repointed at the blob for its content, and the blob's ref_count incremented.
+The first copy of each content is linked into the store; the legacy files are
+only deleted once the batch they belong to has committed, so an interrupted
+run can simply be started again.
+
+Usage:
+    python -m open_tutorai.migrations.dedup_uploads [--dry-run] [--batch-size N]
+"""
+import argparse
+import logging
+import os
+import shutil
+
+from open_tutorai.internal.db import SessionLocal
+from open_tutorai.models.database import SupportBlob, SupportFile, init_database
+from open_tutorai.routers.supports import blob_store
+from open_tutorai.storage.blobs import hash_file
+
+log = logging.getLogger(__name__)
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def dedup_uploads(dry_run: bool = False, batch_size: int = 100) -> dict:
+    stats = {"files": 0, "missing": 0, "duplicates": 0, "bytes_reclaimed": 0}
+    seen = set()
+
+    with SessionLocal() as db:
+        blob_paths = {path for (path,) in db.query(SupportBlob.file_path)}
+        pending = [
+            row_id
+            for (row_id, path) in db.query(SupportFile.id, SupportFile.file_path)
+            if path not in blob_paths
+        ]
+
+        for start in range(0, len(pending), batch_size):
+            batch = (
+                db.query(SupportFile)
+                .filter(SupportFile.id.in_(pending[start : start + batch_size]))
+                .all()
+            )
+            legacy_paths = []
+
+            for record in batch:
+                if not os.path.exists(record.file_path):
+                    log.warning(f"Skipping {record.id}: {record.file_path} is missing")
+                    stats["missing"] += 1
+                    continue
+
+                stats["files"] += 1
+                sha256 = hash_file(record.file_path)
+                size = os.path.getsize(record.file_path)
+                is_duplicate = (
+                    sha256 in seen
+                    or db.query(SupportBlob.sha256)
+                    .filter(SupportBlob.sha256 == sha256)
+                    .first()
+                    is not None
+                )
+                seen.add(sha256)
+
+                if is_duplicate:
+                    stats["duplicates"] += 1
+                    stats["bytes_reclaimed"] += size
+
+                if dry_run:
+                    continue
+
+                # A duplicate only gains a reference; the first copy of each
+                # content is linked into the store to become its blob
+                tmp_path = None
+                if not is_duplicate:
+                    tmp_path = os.path.join(blob_store.root, f".migrate-{record.id}")
+                    _link_or_copy(record.file_path, tmp_path)
+
+                legacy_paths.append(record.file_path)
+                record.file_path = blob_store.acquire(db, sha256, size, tmp_path)
+                record.file_size = size
+                db.flush()
+
+            if dry_run:
+                continue
+
+            db.commit()
+            for path in legacy_paths:
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    log.warning(f"Error deleting legacy file {path}: {str(e)}")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be deduplicated without changing anything",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_database()
+    stats = dedup_uploads(dry_run=args.dry_run, batch_size=args.batch_size)
+
+    print(
+        f"{'Would process' if args.dry_run else 'Processed'} {stats['files']} files: "
+        f"{stats['duplicates']} duplicates, "
+        f"{stats['bytes_reclaimed'] / (1024 * 1024):.1f} MiB reclaimed, "
+        f"{stats['missing']} missing on disk"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Move legacy comma-joined Support.keywords into the keyword table.
+
+Each support whose `keywords` column is still set gets one SupportKeyword row
+per keyword and its legacy column cleared, in batches. Rows that were already
+migrated are skipped, so the migration is safe to run repeatedly. Run it once
+after upgrading from a release that stored keywords on the support row;
+until then responses read those keywords from the legacy column, but the
+supports do not match keyword filters.
+
+Usage:
+    python -m open_tutorai.migrations.normalize_keywords [--batch-size N]
+"""
+import argparse
+import logging
+
+from sqlalchemy import update
+
+from open_tutorai.internal.db import SessionLocal
+from open_tutorai.models.database import Support, init_database
+from open_tutorai.models.keywords import (
+    delete_support_keywords,
+    insert_keyword_rows,
+    keyword_rows,
+)
+
+log = logging.getLogger(__name__)
+
+
+def normalize_keywords(batch_size: int = 1000) -> int:
+    """Migrate all legacy keyword strings, returning the number of supports migrated."""
+    migrated = 0
+
+    with SessionLocal() as db:
+        while True:
+            batch = (
+                db.query(Support.id, Support.keywords)
+                .filter(Support.keywords.isnot(None))
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+
+            support_ids = [support_id for support_id, _ in batch]
+            delete_support_keywords(db, support_ids)
+            insert_keyword_rows(
+                db,
+                [
+                    row
+                    for support_id, keywords in batch
+                    for row in keyword_rows(support_id, keywords.split(","))
+                ],
+            )
+            db.execute(
+                update(Support)
+                .where(Support.id.in_(support_ids))
+                .values(keywords=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            migrated += len(batch)
+            log.info(f"Migrated keywords of {migrated} supports")
+
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_database()
+    print(f"Migrated keywords of {normalize_keywords(args.batch_size)} supports")
+
+
+if __name__ == "__main__":
+    main()
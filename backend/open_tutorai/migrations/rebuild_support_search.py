@@ -0,0 +1,34 @@
+"""
+Rebuild the full-text search index over supports.
+
+Creates the search table if needed, then drops every entry and reindexes all
+supports in one transaction. Use it to backfill supports created before the
+index existed, or after changing how documents are indexed.
+
+Usage:
+    python -m open_tutorai.migrations.rebuild_support_search
+"""
+import argparse
+import logging
+
+from open_tutorai.internal.db import SessionLocal
+from open_tutorai.models.database import init_database
+from open_tutorai.models.search import rebuild_search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_database()
+
+    with SessionLocal() as db:
+        indexed = rebuild_search_index(db)
+        db.commit()
+
+    print(f"Indexed {indexed} supports")
+
+
+if __name__ == "__main__":
+    main()
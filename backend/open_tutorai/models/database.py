@@ -4,12 +4,18 @@ Database module for OpenTutorAI
 This module defines the database tables specific to OpenTutorAI while using
 the same database connection as OpenWebUI to maintain compatibility.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, func, ARRAY
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, func, ARRAY, text
 from sqlalchemy.orm import relationship
 from open_webui.internal.db import Base, get_db, JSONField
 
 PREFIX = "opentutorai_"
 
+# Indexes replaced by wider ones under a new name; init_database() drops them
+SUPERSEDED_INDEXES = (
+    f"ix_{PREFIX}support_user_status_created",
+    f"ix_{PREFIX}support_user_created",
+)
+
 class Support(Base):
     """
     Table for storing student support requests.
@@ -30,6 +36,8 @@ class Support(Base):
     content_language = Column(String, nullable=True, default="English")
     estimated_duration = Column(String, nullable=True)
     access_type = Column(String, nullable=True, default="Private")
+    # Legacy comma-joined keywords, superseded by SupportKeyword and cleared
+    # once migrated
     keywords = Column(String, nullable=True)
     start_date = Column(String, nullable=True)
     end_date = Column(String, nullable=True)
@@ -41,6 +49,20 @@ class Support(Base):
     
     chat_id = Column(String, ForeignKey("chat.id", ondelete="CASCADE"), index=True, nullable=True)
     
+    __table_args__ = (
+        # Serve /supports/list (filtered by user and optionally status, newest
+        # first, ties broken by id) straight from the index without an
+        # in-memory sort
+        Index(
+            f"ix_{PREFIX}support_user_status_created_id",
+            "user_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        Index(f"ix_{PREFIX}support_user_created_id", "user_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Support(id={self.id}, user_id={self.user_id}, title={self.title})>"
 
@@ -63,17 +85,73 @@ class SupportFile(Base):
     def __repr__(self):
         return f"<SupportFile(id={self.id}, support_id={self.support_id}, filename={self.filename})>"
 
+class SupportKeyword(Base):
+    """
+    Table for support keywords, one row per keyword of a support.
+    `normalized` is the lowercased keyword used for exact-match lookups.
+    """
+    __tablename__ = f"{PREFIX}support_keyword"
+    
+    support_id = Column(String, ForeignKey(f"{PREFIX}support.id", ondelete="CASCADE"), primary_key=True)
+    normalized = Column(String, primary_key=True)
+    keyword = Column(String, nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index(f"ix_{PREFIX}support_keyword_normalized", "normalized", "support_id"),
+    )
+    
+    def __repr__(self):
+        return f"<SupportKeyword(support_id={self.support_id}, keyword={self.keyword})>"
+
+class SupportBlob(Base):
+    """
+    Table for content-addressed support file blobs.
+    Identical uploads share one blob on disk; ref_count tracks how many
+    SupportFile rows point at it.
+    """
+    __tablename__ = f"{PREFIX}support_blob"
+    
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String, nullable=False, unique=True, index=True)
+    file_size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<SupportBlob(sha256={self.sha256}, ref_count={self.ref_count})>"
+
 def init_database():
     """
     Initialize the database tables for OpenTutorAI.
     Call this function when your app starts to ensure all tables exist.
     
     This is safe to call even if tables already exist, as SQLAlchemy's
-    create_all() only creates tables that don't exist yet.
+    create_all() only creates tables that don't exist yet, missing indexes
+    are created individually and superseded ones are dropped.
     """
     from open_webui.internal.db import engine
     
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    
+    # create_all() skips existing tables, so indexes added to a table after
+    # it was first created have to be created explicitly
+    for table in (
+        Support.__table__,
+        SupportFile.__table__,
+        SupportKeyword.__table__,
+        SupportBlob.__table__,
+    ):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # Indexes a wider one has replaced would only slow down writes
+    with engine.begin() as connection:
+        for name in SUPERSEDED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    
+    # The full-text index is dialect specific and managed outside the ORM
+    from open_tutorai.models.search import init_search_index
+    init_search_index(engine)
     print("OpenTutorAI database tables initialized successfully")
     
     return engine
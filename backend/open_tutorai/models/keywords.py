@@ -0,0 +1,96 @@
+"""
+Support keyword storage
+
+Keywords live in the opentutorai_support_keyword side table, one row per
+keyword, indexed on the normalized (lowercased) form so keyword filters are
+index lookups rather than LIKE scans over a comma-joined column.
+
+These helpers are blocking and never commit; run them on the database
+executor inside the caller's transaction.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from open_tutorai.models.database import Support, SupportKeyword
+
+
+def normalize_keyword(keyword: str) -> str:
+    return keyword.strip().lower()
+
+
+def clean_keywords(keywords: Optional[Iterable[str]]) -> List[str]:
+    """Strip keywords and drop blanks and case-insensitive duplicates, keeping order."""
+    cleaned, seen = [], set()
+    for keyword in keywords or []:
+        keyword = keyword.strip()
+        normalized = keyword.lower()
+        if keyword and normalized not in seen:
+            seen.add(normalized)
+            cleaned.append(keyword)
+    return cleaned
+
+
+def keyword_rows(support_id: str, keywords: Optional[Iterable[str]]) -> List[dict]:
+    return [
+        {
+            "support_id": support_id,
+            "normalized": keyword.lower(),
+            "keyword": keyword,
+            "position": position,
+        }
+        for position, keyword in enumerate(clean_keywords(keywords))
+    ]
+
+
+def insert_keyword_rows(db: Session, rows: List[dict]):
+    if rows:
+        db.execute(insert(SupportKeyword), rows)
+
+
+def delete_support_keywords(db: Session, support_ids: List[str]):
+    if support_ids:
+        db.query(SupportKeyword).filter(
+            SupportKeyword.support_id.in_(support_ids)
+        ).delete(synchronize_session=False)
+
+
+def set_support_keywords(db: Session, support_id: str, keywords: Optional[Iterable[str]]):
+    """Replace the keywords of one support."""
+    delete_support_keywords(db, [support_id])
+    insert_keyword_rows(db, keyword_rows(support_id, keywords))
+
+
+def load_support_keywords(db: Session, support_ids: List[str]) -> Dict[str, List[str]]:
+    """
+    Fetch the keywords of many supports in one query, in their original order.
+
+    Supports without keyword rows fall back to the legacy comma-joined
+    Support.keywords column, so their keywords show before the
+    normalize_keywords migration has been run.
+    """
+    keywords = defaultdict(list)
+    if not support_ids:
+        return keywords
+
+    rows = (
+        db.query(SupportKeyword.support_id, SupportKeyword.keyword)
+        .filter(SupportKeyword.support_id.in_(support_ids))
+        .order_by(SupportKeyword.support_id, SupportKeyword.position)
+        .all()
+    )
+    for support_id, keyword in rows:
+        keywords[support_id].append(keyword)
+
+    missing = [support_id for support_id in support_ids if support_id not in keywords]
+    if missing:
+        legacy = db.query(Support.id, Support.keywords).filter(
+            Support.id.in_(missing), Support.keywords.isnot(None)
+        )
+        for support_id, joined in legacy:
+            cleaned = clean_keywords(joined.split(","))
+            if cleaned:
+                keywords[support_id] = cleaned
+    return keywords
@@ -0,0 +1,219 @@
+"""
+Full-text search index over supports
+
+Indexes the title, short_description and learning_objective of every support
+in a side table:
+
+- SQLite: an FTS5 virtual table ranked with bm25()
+- PostgreSQL: a weighted tsvector column with a GIN index, ranked with
+  ts_rank()
+
+Other databases fall back to a LIKE scan ordered by recency.
+
+The index is kept in sync explicitly by the supports router. The sync helpers
+are blocking and never commit; run them on the database executor inside the
+caller's transaction so the index changes commit with the support rows.
+"""
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import bindparam, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from open_tutorai.models.database import PREFIX, Support
+
+log = logging.getLogger(__name__)
+
+SUPPORT_TABLE = f"{PREFIX}support"
+SEARCH_TABLE = f"{PREFIX}support_search"
+
+# Relative weight of each indexed column when ranking results
+SQLITE_BM25_WEIGHTS = "0.0, 10.0, 4.0, 2.0"  # support_id, title, short_description, learning_objective
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        support_id UNINDEXED,
+        title,
+        short_description,
+        learning_objective,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+POSTGRES_DDL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        support_id VARCHAR PRIMARY KEY REFERENCES {SUPPORT_TABLE}(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+]
+
+SQLITE_INSERT = f"""
+    INSERT INTO {SEARCH_TABLE} (support_id, title, short_description, learning_objective)
+    SELECT id, title, COALESCE(short_description, ''), COALESCE(learning_objective, '')
+    FROM {SUPPORT_TABLE}
+"""
+
+POSTGRES_INSERT = f"""
+    INSERT INTO {SEARCH_TABLE} (support_id, document)
+    SELECT
+        id,
+        setweight(to_tsvector('simple', COALESCE(title, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(short_description, '')), 'B')
+        || setweight(to_tsvector('simple', COALESCE(learning_objective, '')), 'C')
+    FROM {SUPPORT_TABLE}
+"""
+
+
+def _dialect(bind) -> str:
+    return bind.dialect.name
+
+
+def init_search_index(engine: Engine):
+    """
+    Create the search table for the engine's database if it is missing, and
+    index the existing supports when it is first created.
+    """
+    dialect = _dialect(engine)
+    ddl = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(dialect)
+    if ddl is None:
+        log.info(f"No full-text index for {dialect}, support search uses LIKE")
+        return
+
+    created = not inspect(engine).has_table(SEARCH_TABLE)
+    with engine.begin() as conn:
+        for statement in ddl:
+            conn.execute(text(statement))
+
+        # Backfill supports that predate the index
+        if created:
+            conn.execute(text(SQLITE_INSERT if dialect == "sqlite" else POSTGRES_INSERT))
+
+
+def remove_from_search_index(db: Session, support_ids: List[str]):
+    dialect = _dialect(db.get_bind())
+    if not support_ids or dialect not in ("sqlite", "postgresql"):
+        return
+
+    db.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE support_id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": list(support_ids)},
+    )
+
+
+def sync_search_index(db: Session, support_ids: List[str]):
+    """(Re)index the given supports from their current, possibly unflushed, state."""
+    dialect = _dialect(db.get_bind())
+    if not support_ids or dialect not in ("sqlite", "postgresql"):
+        return
+
+    db.flush()
+    remove_from_search_index(db, support_ids)
+    insert = SQLITE_INSERT if dialect == "sqlite" else POSTGRES_INSERT
+    db.execute(
+        text(f"{insert} WHERE id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": list(support_ids)},
+    )
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Drop every index entry and reindex all supports. Returns the row count."""
+    dialect = _dialect(db.get_bind())
+    if dialect not in ("sqlite", "postgresql"):
+        return 0
+
+    db.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    db.execute(text(SQLITE_INSERT if dialect == "sqlite" else POSTGRES_INSERT))
+    return db.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar()
+
+
+def to_fts5_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every term must match, quoted so
+    user input cannot use FTS5 syntax, and the last term matches as a prefix.
+    """
+    terms = re.findall(r"\w+", query, flags=re.UNICODE)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_support_ids(
+    db: Session,
+    query: str,
+    user_id: Optional[str],
+    status: Optional[str],
+    limit: int,
+    offset: int,
+) -> List[str]:
+    """
+    Return the ids of matching supports, best match first.
+
+    Only supports owned by `user_id` are searched, or public supports when
+    `user_id` is None.
+    """
+    dialect = _dialect(db.get_bind())
+
+    if dialect not in ("sqlite", "postgresql"):
+        pattern = f"%{query}%"
+        q = db.query(Support.id).filter(
+            or_(
+                Support.title.ilike(pattern),
+                Support.short_description.ilike(pattern),
+                Support.learning_objective.ilike(pattern),
+            )
+        )
+        q = q.filter(Support.user_id == user_id) if user_id else q.filter(
+            Support.access_type == "Public"
+        )
+        if status:
+            q = q.filter(Support.status == status)
+        q = q.order_by(Support.created_at.desc(), Support.id.desc())
+        return [support_id for (support_id,) in q.limit(limit).offset(offset)]
+
+    params = {"limit": limit, "offset": offset}
+    filters = []
+    if user_id:
+        filters.append("s.user_id = :user_id")
+        params["user_id"] = user_id
+    else:
+        filters.append("s.access_type = 'Public'")
+    if status:
+        filters.append("s.status = :status")
+        params["status"] = status
+
+    if dialect == "sqlite":
+        params["query"] = to_fts5_query(query)
+        if not params["query"]:
+            return []
+        statement = f"""
+            SELECT s.id FROM {SEARCH_TABLE} f
+            JOIN {SUPPORT_TABLE} s ON s.id = f.support_id
+            WHERE {SEARCH_TABLE} MATCH :query AND {" AND ".join(filters)}
+            ORDER BY bm25({SEARCH_TABLE}, {SQLITE_BM25_WEIGHTS}), s.id
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        params["query"] = query
+        statement = f"""
+            SELECT s.id FROM {SEARCH_TABLE} f
+            JOIN {SUPPORT_TABLE} s ON s.id = f.support_id,
+            websearch_to_tsquery('simple', :query) q
+            WHERE f.document @@ q AND {" AND ".join(filters)}
+            ORDER BY ts_rank(f.document, q) DESC, s.id
+            LIMIT :limit OFFSET :offset
+        """
+
+    return [support_id for (support_id,) in db.execute(text(statement), params)]
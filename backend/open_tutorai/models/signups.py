@@ -0,0 +1,142 @@
+"""
+Signup storage
+
+A signup writes the auth and user rows OpenWebUI's Auths.insert_new_auth
+would, and for the first student or teacher also makes the first model
+public so new users have a model to talk to. All of it goes through one
+session on the OpenTutorAI pool, in a single transaction.
+
+The upstream helpers cannot take part in that transaction: in the pinned
+open-webui (0.5.16, see requirements.txt) Auths.insert_new_auth and
+Users.insert_new_user each open and commit their own session. create_user
+therefore writes the same columns they do: id, email, password and active
+for the auth row; id, name, email, role, profile_image_url, last_active_at,
+created_at and updated_at for the user row, leaving oauth_sub, api_key,
+settings and info unset. Check this list when upgrading open-webui.
+
+SignupCache keeps what a burst of signups would otherwise look up on every
+request: the number of users, and whether the model has been made public.
+
+The helpers taking a session are blocking and must run on the database
+executor.
+"""
+import logging
+import threading
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from open_webui.models.auths import Auth, AuthModel
+from open_webui.models.models import Model
+from open_webui.models.users import User, UserModel
+
+log = logging.getLogger(__name__)
+
+
+class SignupCache:
+    """
+    Per-process memory of the signup path.
+
+    The user count is cached for `user_count_ttl` seconds and bumped by the
+    signups made here; users added or removed through OpenWebUI show up once
+    it expires. A count of zero is never cached, so the check that makes the
+    first user admin always reads the database.
+    """
+
+    def __init__(self, user_count_ttl: float):
+        self.user_count_ttl = user_count_ttl
+        self.first_model_public = False
+        self._lock = threading.Lock()
+        self._user_count: Optional[int] = None
+        self._expires_at = 0.0
+
+    def cached_user_count(self) -> Optional[int]:
+        """The cached count, or None when it has to be read with user_count()."""
+        with self._lock:
+            if self._user_count is not None and time.monotonic() < self._expires_at:
+                return self._user_count
+        return None
+
+    def user_count(self, db: Session) -> int:
+        cached = self.cached_user_count()
+        if cached is not None:
+            return cached
+        count = count_users(db)
+        with self._lock:
+            if count:
+                self._user_count = count
+                self._expires_at = time.monotonic() + self.user_count_ttl
+        return count
+
+    def user_added(self):
+        with self._lock:
+            if self._user_count is not None:
+                self._user_count += 1
+
+
+def count_users(db: Session) -> int:
+    return db.query(func.count(User.id)).scalar() or 0
+
+
+def email_taken(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def publish_first_model(db: Session) -> Optional[str]:
+    """
+    Clear the access control of the first model, the one
+    Models.get_all_models()[0] returns, and return its id, if any. Like
+    Models.update_model_by_id, which signup used to call, it leaves
+    updated_at alone.
+    """
+    model_id = db.query(Model.id).limit(1).scalar()
+    if model_id is not None:
+        db.execute(update(Model).where(Model.id == model_id).values(access_control=None))
+    return model_id
+
+
+def create_user(
+    db: Session,
+    cache: SignupCache,
+    email: str,
+    password: str,
+    name: str,
+    profile_image_url: str,
+    role: str,
+    publish_model: bool,
+) -> UserModel:
+    """
+    Insert the auth and user rows, and make the first model public when
+    `publish_model` is set and the cache says that has not been done yet,
+    then commit them together.
+    """
+    now = int(time.time())
+    user_id = str(uuid.uuid4())
+    auth = AuthModel(id=user_id, email=email, password=password, active=True)
+    user = UserModel(
+        id=user_id,
+        name=name,
+        email=email,
+        role=role,
+        profile_image_url=profile_image_url,
+        last_active_at=now,
+        updated_at=now,
+        created_at=now,
+    )
+    db.add(Auth(**auth.model_dump()))
+    db.add(User(**user.model_dump()))
+
+    published = None
+    if publish_model and not cache.first_model_public:
+        published = publish_first_model(db)
+
+    db.commit()
+
+    cache.user_added()
+    if published is not None:
+        cache.first_model_public = True
+        log.info(f"Made model {published} public for new users")
+    return user
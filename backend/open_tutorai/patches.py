@@ -1,5 +1,6 @@
 import os
 import builtins
+from contextlib import contextmanager
 from pathlib import Path
 
 # Set DATA_DIR to backend/data by default
@@ -25,13 +26,25 @@ WEBUI_SIGNATURE_LINE = """
 
 
 def custom_print(*args, **kwargs):
-    output = " ".join(str(arg) for arg in args)
-
-    # Detect the WebUI banner using a unique line
-    if WEBUI_SIGNATURE_LINE in output:
-        if os.environ.get("SUPPRESS_WEBUI_BANNER") == "true":
-            return  # Suppress the banner
+    # The banner is printed as a single string; anything else is not it
+    if args and isinstance(args[0], str) and WEBUI_SIGNATURE_LINE in args[0]:
+        return  # Suppress the banner
     return original_print(*args, **kwargs)
 
 
-builtins.print = custom_print
\ No newline at end of file
+@contextmanager
+def webui_banner_suppressed():
+    """
+    Suppress the WebUI banner printed while open_webui.main is imported.
+    print is only wrapped inside the block, so later prints cost nothing.
+    """
+    if os.environ.get("SUPPRESS_WEBUI_BANNER") != "true":
+        yield
+        return
+    builtins.print = custom_print
+    try:
+        yield
+    finally:
+        # Unless something else replaced print in the meantime
+        if builtins.print is custom_print:
+            builtins.print = original_print
@@ -4,12 +4,9 @@ import logging
 
 from open_webui.models.auths import (
     AddUserForm,
-    Auths,
     Token,
     UserResponse,
 )
-from open_webui.models.users import Users
-from open_webui.models.models import Models, ModelForm
 
 from open_webui.constants import ERROR_MESSAGES, WEBHOOK_MESSAGES
 from open_webui.env import (
@@ -29,6 +26,17 @@ from open_webui.utils.auth import (
 from open_webui.utils.webhook import post_webhook
 from open_webui.utils.access_control import get_permissions
 
+from sqlalchemy.orm import Session
+
+from open_tutorai.env import (
+    USER_COUNT_CACHE_TTL,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE,
+)
+from open_tutorai.internal.db import get_session, run_in_db_executor, run_with_session
+from open_tutorai.models.signups import SignupCache, count_users, create_user, email_taken
+from open_tutorai.utils.hashing import PasswordHasher
+
 from typing import Optional
 
 router = APIRouter()
@@ -36,6 +44,11 @@ router = APIRouter()
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+signup_cache = SignupCache(USER_COUNT_CACHE_TTL)
+password_hasher = PasswordHasher(
+    get_password_hash, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+)
+
 
 class SessionUserResponse(Token, UserResponse):
     expires_at: Optional[int] = None
@@ -43,7 +56,13 @@ class SessionUserResponse(Token, UserResponse):
 
 
 @router.post("/signup", response_model=SessionUserResponse)
-async def signup(request: Request, response: Response, form_data: AddUserForm):
+async def signup(
+    request: Request,
+    response: Response,
+    form_data: AddUserForm,
+):
+    # No request-scoped session: each database step checks a connection out
+    # only for itself, so none is held while the password waits to be hashed
 
     if WEBUI_AUTH:
         if (
@@ -53,24 +72,26 @@ async def signup(request: Request, response: Response, form_data: AddUserForm):
             raise HTTPException(
                 status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.ACCESS_PROHIBITED
             )
-    else:
-        if Users.get_num_users() != 0:
-            raise HTTPException(
-                status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.ACCESS_PROHIBITED
-            )
 
-    user_count = Users.get_num_users()
+    user_count = signup_cache.cached_user_count()
+    if user_count is None:
+        user_count = await run_with_session(signup_cache.user_count)
+    if not WEBUI_AUTH and user_count != 0:
+        raise HTTPException(
+            status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.ACCESS_PROHIBITED
+        )
     # if request.app.state.USER_COUNT and user_count >= request.app.state.USER_COUNT:
     #     raise HTTPException(
     #         status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.ACCESS_PROHIBITED
     #     )
 
-    if not validate_email_format(form_data.email.lower()):
+    email = form_data.email.lower()
+    if not validate_email_format(email):
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.INVALID_EMAIL_FORMAT
         )
 
-    if Users.get_user_by_email(form_data.email.lower()):
+    if await run_with_session(email_taken, email):
         raise HTTPException(400, detail=ERROR_MESSAGES.EMAIL_TAKEN)
 
     try:
@@ -87,46 +108,23 @@ async def signup(request: Request, response: Response, form_data: AddUserForm):
 
         log.info(f"Creating new user with role: {role}")
 
-        hashed = get_password_hash(form_data.password)
-        user = Auths.insert_new_auth(
-            form_data.email.lower(),
+        # On its own pool so bcrypt does not stall the event loop; 503 when full
+        hashed = await password_hasher.hash(form_data.password)
+        # One transaction for the auth and user rows and, for the first user
+        # after the admin, making the admin's first model public
+        user = await run_with_session(
+            create_user,
+            signup_cache,
+            email,
             hashed,
             form_data.name,
             form_data.profile_image_url,
             role,
+            publish_model=user_count > 0,
         )
 
         if user:
 
-            # If this is not the first user (admin), update admin models to be public
-            if user_count > 0:
-                # Get all models
-                # Get all models
-                all_models = Models.get_all_models()
-
-                # Optional: Debug print
-                print("All models:")
-                print(all_models)
-
-                # Check if there is at least one model
-                if all_models:
-                    first_model = all_models[0]
-
-                    # Update the first model to make it public
-                    updated_model = ModelForm(
-                        id=first_model.id,
-                        name=first_model.name,
-                        base_model_id=first_model.base_model_id,
-                        meta=first_model.meta,
-                        params=first_model.params,
-                        access_control=None,  # Make public
-                        is_active=first_model.is_active
-                    )
-                    Models.update_model_by_id(first_model.id, updated_model)
-                else:
-                    print("No models found.")
-
-
             expires_delta = parse_duration(request.app.state.config.JWT_EXPIRES_IN)
             expires_at = None
             if expires_delta:
@@ -182,14 +180,17 @@ async def signup(request: Request, response: Response, form_data: AddUserForm):
             }
         else:
             raise HTTPException(500, detail=ERROR_MESSAGES.CREATE_USER_ERROR)
+    except HTTPException:
+        raise
     except Exception as err:
         raise HTTPException(500, detail=ERROR_MESSAGES.DEFAULT(err))
 
 @router.get("/user-count")
-async def get_user_count():
+async def get_user_count(db: Session = Depends(get_session)):
     """Get the total number of users in the system"""
     try:
-        user_count = Users.get_num_users()
+        # Read the database: the signup cache can lag behind other workers
+        user_count = await run_in_db_executor(count_users, db)
         return {"count": user_count}
     except Exception as err:
         raise HTTPException(500, detail=ERROR_MESSAGES.DEFAULT(err))
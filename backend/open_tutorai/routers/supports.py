@@ -1,17 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query, Request
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
 import logging
 import uuid
+import base64
 from datetime import datetime
 import os
 import json
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from open_webui.utils.auth import get_verified_user
-from open_tutorai.models.database import Support, SupportFile, Base
-from sqlalchemy.orm import sessionmaker
-from open_webui.internal.db import engine
+from open_tutorai.models.database import Support, SupportFile, SupportBlob, SupportKeyword
+from open_tutorai.internal.db import get_session, run_in_db_executor
+from open_tutorai.models.search import (
+    search_support_ids,
+    sync_search_index,
+    remove_from_search_index,
+)
+from open_tutorai.models.keywords import (
+    clean_keywords,
+    keyword_rows,
+    insert_keyword_rows,
+    delete_support_keywords,
+    set_support_keywords,
+    load_support_keywords,
+    normalize_keyword,
+)
+from open_tutorai.storage.blobs import BlobStore
+from open_tutorai.utils.uploads import spool_upload
+from open_tutorai.utils.files import serve_file
+from open_tutorai.utils.serializers import compile_support_serializer
+from open_tutorai.env import SUPPORT_UPLOAD_DIR, SUPPORT_FILE_ACCEL_REDIRECT_PREFIX
+from sqlalchemy import and_, or_, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 # Setup logging
 log = logging.getLogger(__name__)
@@ -20,9 +42,12 @@ log.setLevel("INFO")
 router = APIRouter()
 
 # Make sure upload directory exists
-UPLOAD_DIR = "data/uploads"
+UPLOAD_DIR = SUPPORT_UPLOAD_DIR
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Support files are deduplicated by content under UPLOAD_DIR/blobs
+blob_store = BlobStore(os.path.join(UPLOAD_DIR, "blobs"))
+
 # Models for request and response
 class SupportCreateRequest(BaseModel):
     title: str
@@ -42,6 +67,46 @@ class SupportCreateRequest(BaseModel):
     avatar_id: Optional[str] = None
     chat_id: Optional[str] = None
 
+# Partial update of one support in a bulk update request
+class SupportBulkUpdateItem(BaseModel):
+    id: str
+    title: Optional[str] = None
+    short_description: Optional[str] = None
+    subject: Optional[str] = None
+    custom_subject: Optional[str] = None
+    course_id: Optional[str] = None
+    learning_objective: Optional[str] = None
+    learning_type: Optional[str] = None
+    level: Optional[str] = None
+    content_language: Optional[str] = None
+    estimated_duration: Optional[str] = None
+    access_type: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    avatar_id: Optional[str] = None
+    chat_id: Optional[str] = None
+
+class SupportBulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad item only fails itself
+    items: List[dict]
+    # Reject the whole batch if any item is invalid
+    atomic: bool = False
+
+class SupportBulkUpdateRequest(BaseModel):
+    items: List[dict]
+    atomic: bool = False
+
+class SupportBulkDeleteRequest(BaseModel):
+    ids: List[str]
+
+# Attach an already stored file to a support by its content hash
+class SupportFileLinkRequest(BaseModel):
+    support_id: str
+    sha256: str
+    filename: str
+    file_type: Optional[str] = None
+
 # Support response model
 class SupportResponse(BaseModel):
     id: str
@@ -66,19 +131,11 @@ class SupportResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-def get_db_session():
-    """Get a database session using the same engine as OpenWebUI"""
-    # Log for debugging
-    print("Using OpenWebUI database engine for supports")
-    
-    # Create session
-    Session = sessionmaker(bind=engine)
-    return Session()
-
 @router.post("/supports/create")
 async def create_support(
     support_data: SupportCreateRequest,
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
     Create a new support request
@@ -94,7 +151,7 @@ async def create_support(
         user_id = user.id if user else "anonymous"
         
         # Prepare keywords
-        keywords_str = ",".join(support_data.keywords) if support_data.keywords else None
+        keywords = clean_keywords(support_data.keywords)
         
         # Create support object
         support = Support(
@@ -111,7 +168,6 @@ async def create_support(
             content_language=support_data.content_language,
             estimated_duration=support_data.estimated_duration,
             access_type=support_data.access_type,
-            keywords=keywords_str,
             start_date=support_data.start_date,
             end_date=support_data.end_date,
             avatar_id=support_data.avatar_id,
@@ -121,195 +177,808 @@ async def create_support(
             updated_at=datetime.now()
         )
         
-        # Save to database
-        session = get_db_session()
-        
-        try:
-            session.add(support)
-            session.commit()
-            
-            # Create response object
-            response = SupportResponse(
-                id=support.id,
-                user_id=support.user_id,
-                title=support.title,
-                short_description=support.short_description,
-                subject=support.subject,
-                custom_subject=support.custom_subject,
-                course_id=support.course_id,
-                learning_objective=support.learning_objective,
-                learning_type=support.learning_type,
-                level=support.level,
-                content_language=support.content_language,
-                estimated_duration=support.estimated_duration,
-                access_type=support.access_type,
-                keywords=support.keywords.split(",") if support.keywords else None,
-                start_date=support.start_date,
-                end_date=support.end_date,
-                avatar_id=support.avatar_id,
-                status=support.status,
-                chat_id=support.chat_id,
-                created_at=support.created_at,
-                updated_at=support.updated_at
-            )
-            
-            return response
-        finally:
-            session.close()
+        # Save to database, keywords after the support they reference
+        db.add(support)
+        await run_in_db_executor(db.flush)
+        await run_in_db_executor(insert_keyword_rows, db, keyword_rows(support_id, keywords))
+        await run_in_db_executor(sync_search_index, db, [support_id])
+        await run_in_db_executor(db.commit)
+
+        return support_json_response(serialize_support(support, keywords))
             
     except Exception as e:
         log.error(f"Error creating support request: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create support request: {str(e)}")
 
+def require_own_support(db: Session, support_id: str, user_id: str):
+    """Raise a 404 unless `support_id` is a support of `user_id`."""
+    owned = (
+        db.query(Support.id)
+        .filter(Support.id == support_id, Support.user_id == user_id)
+        .first()
+    )
+    if owned is None:
+        raise HTTPException(status_code=404, detail="Support not found")
+
+
+def attach_support_file(
+    db: Session,
+    user_id: str,
+    support_id: str,
+    filename: str,
+    file_type: Optional[str],
+    sha256: str,
+    size: Optional[int] = None,
+    tmp_path: Optional[str] = None,
+):
+    """
+    Reference the blob for `sha256` from a new SupportFile row and commit.
+
+    Blocking; run on the database executor. The support must belong to
+    `user_id`. Without `tmp_path`, only a blob the user already references
+    from one of their own supports can be linked, so a hash tells nothing
+    about other users' files. Both cases are 404s, raised before anything
+    is stored.
+    """
+    require_own_support(db, support_id, user_id)
+
+    if tmp_path is None:
+        size = (
+            db.query(SupportBlob.file_size)
+            .join(SupportFile, SupportFile.file_path == SupportBlob.file_path)
+            .join(Support, Support.id == SupportFile.support_id)
+            .filter(SupportBlob.sha256 == sha256, Support.user_id == user_id)
+            .limit(1)
+            .scalar()
+        )
+        if size is None:
+            raise HTTPException(status_code=404, detail="File not found, upload it instead")
+
+    for attempt in range(2):
+        try:
+            blob_path = blob_store.acquire(db, sha256, size, tmp_path)
+            break
+        except IntegrityError:
+            # A concurrent upload created the same blob first; retry as a
+            # reference to it, which discards our copy
+            db.rollback()
+            if attempt:
+                raise
+    if blob_path is None:
+        # Released by a concurrent delete since it was looked up
+        raise HTTPException(status_code=404, detail="File not found, upload it instead")
+
+    file_record = SupportFile(
+        id=str(uuid.uuid4()),
+        support_id=support_id,
+        filename=filename,
+        file_path=blob_path,
+        file_type=file_type,
+        file_size=size,
+        created_at=datetime.now()
+    )
+    db.add(file_record)
+
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        # An upload moved into the store has no row now; unlink it unless
+        # the blob is referenced by rows that did commit
+        blob_store.remove_orphans(db, [blob_path])
+        db.commit()
+        raise
+    return file_record
+
 @router.post("/supports/upload-file")
 async def upload_support_file(
+    request: Request,
     support_id: str = Form(...),
     file: UploadFile = File(...),
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
-    Upload a file for a support request
+    Upload a file for a support request.
+
+    The file is streamed to disk in chunks off the event loop. Bodies over
+    SUPPORT_UPLOAD_MAX_SIZE are turned away with a 413 by
+    UploadSizeLimitMiddleware while they arrive; the check here bounds the
+    file part itself. Identical content is stored once and shared between
+    SupportFile rows.
     """
     try:
-        # Generate a unique filename
-        file_id = str(uuid.uuid4())
-        file_extension = os.path.splitext(file.filename)[1]
-        save_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_extension}")
-        
-        with open(save_path, "wb") as f:
-            contents = await file.read()
-            f.write(contents)
-        
-        file_record = SupportFile(
-            id=file_id,
-            support_id=support_id,
-            filename=file.filename,
-            file_path=save_path,
-            file_type=file.content_type,
-            file_size=len(contents),
-            created_at=datetime.now()
+        # Checked before the upload is read; attach_support_file checks again
+        await run_in_db_executor(require_own_support, db, support_id, user.id)
+
+        stored = await spool_upload(
+            file,
+            blob_store.root,
+            max_size=request.app.state.config.SUPPORT_UPLOAD_MAX_SIZE,
         )
         
-        session = get_db_session()
-        
         try:
-            session.add(file_record)
-            session.commit()
-            return {"id": file_id, "filename": file.filename, "status": "success"}
+            file_record = await run_in_db_executor(
+                attach_support_file,
+                db,
+                user.id,
+                support_id,
+                file.filename,
+                file.content_type,
+                stored.sha256,
+                stored.size,
+                stored.path,
+            )
         finally:
-            session.close()
+            # Only left behind if the blob could not be stored
+            if os.path.exists(stored.path):
+                os.unlink(stored.path)
+        
+        return {
+            "id": file_record.id,
+            "filename": file_record.filename,
+            "size": stored.size,
+            "sha256": stored.sha256,
+            "status": "success",
+        }
             
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error uploading file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
+@router.post("/supports/upload-file/by-hash")
+async def link_support_file(
+    form_data: SupportFileLinkRequest,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Attach a file to a support request without uploading it again.
+
+    Succeeds instantly when the user already has a file with the same
+    SHA-256 on one of their supports, otherwise returns a 404 and the client
+    should fall back to /supports/upload-file.
+    """
+    try:
+        file_record = await run_in_db_executor(
+            attach_support_file,
+            db,
+            user.id,
+            form_data.support_id,
+            form_data.filename,
+            form_data.file_type,
+            form_data.sha256.lower(),
+        )
+
+        return {
+            "id": file_record.id,
+            "filename": file_record.filename,
+            "sha256": form_data.sha256.lower(),
+            "status": "success",
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error linking file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to link file: {str(e)}")
+
+@router.api_route("/supports/files/{file_id}/download", methods=["GET", "HEAD"])
+async def download_support_file(
+    request: Request,
+    file_id: str,
+    download: bool = False,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Download a support file.
+
+    Supports Range requests for media seeking, and answers conditional
+    requests with a 304. Files are served inline unless `download` is set.
+    """
+    try:
+        query = (
+            db.query(SupportFile, SupportBlob.sha256)
+            .join(Support, Support.id == SupportFile.support_id)
+            .outerjoin(SupportBlob, SupportBlob.file_path == SupportFile.file_path)
+            .filter(SupportFile.id == file_id)
+        )
+        if user:
+            query = query.filter(
+                or_(Support.user_id == user.id, Support.access_type == "Public")
+            )
+        else:
+            query = query.filter(Support.access_type == "Public")
+
+        result = await run_in_db_executor(query.first)
+        if not result:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        file_record, sha256 = result
+        if not os.path.exists(file_record.file_path):
+            log.warning(f"Support file {file_id} missing on disk: {file_record.file_path}")
+            raise HTTPException(status_code=404, detail="File not found")
+
+        return await serve_file(
+            request,
+            file_record.file_path,
+            filename=file_record.filename,
+            media_type=file_record.file_type,
+            # Blobs are content-addressed, so their hash is a strong validator
+            etag=sha256,
+            inline=not download,
+            root=UPLOAD_DIR,
+            accel_redirect_prefix=SUPPORT_FILE_ACCEL_REDIRECT_PREFIX,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error downloading file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to download file: {str(e)}")
+
+# Columns a client may request through the `fields` projection of /supports/list
+SUPPORT_LIST_FIELDS = tuple(SupportResponse.model_fields)
+
+# Keyset pagination needs these columns on every row to build the next cursor
+SUPPORT_CURSOR_FIELDS = ("created_at", "id")
+
+SUPPORT_LIST_DEFAULT_LIMIT = 100
+SUPPORT_LIST_MAX_LIMIT = 1000
+
+
+def encode_support_cursor(created_at: datetime, support_id: str) -> str:
+    """Encode the (created_at, id) keyset position of a row as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{support_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_support_cursor(cursor: str):
+    """Decode a cursor produced by encode_support_cursor, or raise a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, support_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), support_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_support_fields(fields: Optional[str]) -> List[str]:
+    """Parse a `fields` projection, or raise a 400 for unknown fields."""
+    if not fields:
+        return list(SUPPORT_LIST_FIELDS)
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SUPPORT_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return requested
+
+
+def support_columns(requested: List[str], extra=()) -> list:
+    """Columns to SELECT for a projection; keywords live in their own table."""
+    selected = dict.fromkeys([*(f for f in requested if f != "keywords"), *extra])
+    return [getattr(Support, f) for f in selected]
+
+
+def serialize_support(support: Support, keywords: Optional[List[str]]) -> dict:
+    """Serialize one support with every response field."""
+    return compile_support_serializer(SUPPORT_LIST_FIELDS)(
+        [support], {support.id: keywords}
+    )[0]
+
+
+async def serialize_support_rows(db: Session, rows, requested: List[str]) -> List[dict]:
+    """Build response dicts for projected rows, loading keywords in one query."""
+    keywords = None
+    if "keywords" in requested:
+        keywords = await run_in_db_executor(
+            load_support_keywords, db, [row.id for row in rows]
+        )
+    return compile_support_serializer(tuple(requested))(rows, keywords)
+
+
+def support_json_response(content, next_cursor: Optional[str] = None) -> ORJSONResponse:
+    """Encode supports with orjson, bypassing FastAPI's jsonable_encoder."""
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(content, headers=headers)
+
+
+async def get_support_page(
+    db: Session,
+    user,
+    status: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+    keyword: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Fetch one keyset-paginated page of the supports visible to `user`.
+
+    Returns the page and the cursor of the next page, or None on the last
+    page. Raises a 400 for unknown `fields` or a malformed `cursor`.
+    """
+    requested = parse_support_fields(fields)
+    query = db.query(*support_columns(requested, SUPPORT_CURSOR_FIELDS))
+
+    if keyword:
+        query = query.join(SupportKeyword, SupportKeyword.support_id == Support.id).filter(
+            SupportKeyword.normalized == normalize_keyword(keyword)
+        )
+
+    if user:
+        query = query.filter(Support.user_id == user.id)
+    else:
+        query = query.filter(Support.access_type == "Public")
+
+    if status:
+        query = query.filter(Support.status == status)
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_support_cursor(cursor)
+        query = query.filter(
+            or_(
+                Support.created_at < cursor_created_at,
+                and_(
+                    Support.created_at == cursor_created_at,
+                    Support.id < cursor_id,
+                ),
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(Support.created_at.desc(), Support.id.desc())
+    rows = await run_in_db_executor(query.limit(limit + 1).all)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_support_cursor(last.created_at, last.id)
+
+    return await serialize_support_rows(db, rows, requested), next_cursor
+
+
 @router.get("/supports/list")
 async def get_support_requests(
     status: Optional[str] = None,
-    user = Depends(get_verified_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(SUPPORT_LIST_DEFAULT_LIMIT, ge=1, le=SUPPORT_LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
-    Get list of support requests for the current user
+    Get list of support requests for the current user, newest first.
+
+    Results are keyset-paginated on (created_at, id): pass the value of the
+    `X-Next-Cursor` response header back as `cursor` to fetch the next page.
+    The header is absent on the last page. `fields` is an optional
+    comma-separated list of columns to return; only those are selected.
     """
     try:
-        session = get_db_session()
-        
-        try:
-            if user:
-                query = session.query(Support).filter(Support.user_id == user.id)
-            else:
-                query = session.query(Support).filter(Support.access_type == "Public")
-            
-            if status:
-                query = query.filter(Support.status == status)
-                
-            supports = query.order_by(Support.created_at.desc()).all()
-            
-            results = []
-            for support in supports:
-                results.append({
-                    "id": support.id,
-                    "user_id": support.user_id,
-                    "title": support.title,
-                    "short_description": support.short_description,
-                    "subject": support.subject,
-                    "custom_subject": support.custom_subject,
-                    "course_id": support.course_id,
-                    "learning_objective": support.learning_objective,
-                    "learning_type": support.learning_type,
-                    "level": support.level,
-                    "content_language": support.content_language,
-                    "estimated_duration": support.estimated_duration,
-                    "access_type": support.access_type,
-                    "keywords": support.keywords.split(",") if support.keywords else None,
-                    "start_date": support.start_date,
-                    "end_date": support.end_date,
-                    "avatar_id": support.avatar_id,
-                    "status": support.status,
-                    "chat_id": support.chat_id,
-                    "created_at": support.created_at.isoformat() if support.created_at else None,
-                    "updated_at": support.updated_at.isoformat() if support.updated_at else None
-                })
-            
-            return results
-        finally:
-            session.close()
-            
+        items, next_cursor = await get_support_page(db, user, status, cursor, limit, fields)
+        return support_json_response(items, next_cursor)
+
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error getting support requests: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get support requests: {str(e)}")
 
+
+@router.get("/supports/search")
+async def search_supports_by_keyword(
+    keyword: str = Query(..., min_length=1),
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(SUPPORT_LIST_DEFAULT_LIMIT, ge=1, le=SUPPORT_LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Get the current user's support requests tagged with `keyword`.
+
+    Matching is exact and case-insensitive, served from the keyword index.
+    Pagination and `fields` work as for /supports/list.
+    """
+    try:
+        items, next_cursor = await get_support_page(
+            db, user, status, cursor, limit, fields, keyword=keyword
+        )
+        return support_json_response(items, next_cursor)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error searching support requests: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search support requests: {str(e)}")
+
+def encode_offset_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, offset = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        if kind != "offset" or int(offset) < 0:
+            raise ValueError(kind)
+        return int(offset)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/supports/search/text")
+async def search_supports_by_text(
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(SUPPORT_LIST_DEFAULT_LIMIT, ge=1, le=SUPPORT_LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Full-text search over the title, short description and learning
+    objective of the current user's support requests, best match first.
+
+    Paginate with the `X-Next-Cursor` header as for /supports/list.
+    """
+    try:
+        requested = parse_support_fields(fields)
+        offset = decode_offset_cursor(cursor) if cursor else 0
+
+        ids = await run_in_db_executor(
+            search_support_ids,
+            db,
+            q,
+            user.id if user else None,
+            status,
+            limit + 1,
+            offset,
+        )
+        next_cursor = None
+        if len(ids) > limit:
+            ids = ids[:limit]
+            next_cursor = encode_offset_cursor(offset + limit)
+
+        if not ids:
+            return support_json_response([])
+
+        rows = await run_in_db_executor(
+            db.query(*support_columns(requested, ("id",)))
+            .filter(Support.id.in_(ids))
+            .all
+        )
+        order = {support_id: position for position, support_id in enumerate(ids)}
+        rows.sort(key=lambda row: order[row.id])
+
+        return support_json_response(
+            await serialize_support_rows(db, rows, requested), next_cursor
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error searching support requests: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search support requests: {str(e)}")
+
+SUPPORT_BULK_MAX_ITEMS = 10000
+
+# Columns that are NOT NULL on the table; checked per item so one bad item
+# cannot abort the whole bulk insert or update
+SUPPORT_REQUIRED_FIELDS = ("title", "subject", "level")
+
+
+def check_bulk_size(count: int):
+    if count > SUPPORT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Bulk requests are limited to {SUPPORT_BULK_MAX_ITEMS} items",
+        )
+
+
+def validate_bulk_items(items: List[dict], model, partial: bool = False):
+    """Validate raw bulk items, returning (index, item) pairs and per-item errors."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        try:
+            parsed = model.model_validate(item)
+        except ValidationError as e:
+            errors.append(
+                {
+                    "index": index,
+                    "id": item_id,
+                    "status": "error",
+                    "detail": e.errors(include_url=False, include_context=False),
+                }
+            )
+            continue
+
+        fields = parsed.model_fields_set if partial else SUPPORT_REQUIRED_FIELDS
+        missing = [
+            field
+            for field in SUPPORT_REQUIRED_FIELDS
+            if field in fields and getattr(parsed, field) is None
+        ]
+        if missing:
+            errors.append(
+                {
+                    "index": index,
+                    "id": item_id,
+                    "status": "error",
+                    "detail": f"Fields cannot be null: {', '.join(missing)}",
+                }
+            )
+            continue
+
+        valid.append((index, parsed))
+    return valid, errors
+
+
+def bulk_response(results: List[dict], succeeded: str) -> dict:
+    results.sort(key=lambda result: result["index"])
+    return {
+        "results": results,
+        succeeded: sum(1 for result in results if result["status"] != "error"),
+        "failed": sum(1 for result in results if result["status"] == "error"),
+    }
+
+
+@router.post("/supports/bulk")
+async def bulk_create_supports(
+    form_data: SupportBulkCreateRequest,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Create many support requests in a single transaction.
+
+    Each item has the shape of a /supports/create body. Invalid items are
+    reported individually and the valid ones are inserted with one
+    executemany-style INSERT, unless `atomic` is set, in which case any
+    invalid item rejects the whole batch.
+    """
+    check_bulk_size(len(form_data.items))
+
+    try:
+        valid, errors = validate_bulk_items(form_data.items, SupportCreateRequest)
+        if errors and form_data.atomic:
+            return JSONResponse(status_code=422, content=bulk_response(errors, "created"))
+
+        user_id = user.id if user else "anonymous"
+        now = datetime.now()
+        rows, keyword_values, results = [], [], list(errors)
+        for index, support_data in valid:
+            support_id = str(uuid.uuid4())
+            rows.append(
+                {
+                    **support_data.model_dump(exclude={"keywords"}),
+                    "id": support_id,
+                    "user_id": user_id,
+                    "status": "pending",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            keyword_values.extend(keyword_rows(support_id, support_data.keywords))
+            results.append({"index": index, "id": support_id, "status": "created"})
+
+        if rows:
+            await run_in_db_executor(db.execute, insert(Support), rows)
+            await run_in_db_executor(insert_keyword_rows, db, keyword_values)
+            await run_in_db_executor(
+                sync_search_index, db, [row["id"] for row in rows]
+            )
+            await run_in_db_executor(db.commit)
+
+        return bulk_response(results, "created")
+
+    except Exception as e:
+        log.error(f"Error bulk creating support requests: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create support requests: {str(e)}")
+
+
+@router.patch("/supports/bulk")
+async def bulk_update_supports(
+    form_data: SupportBulkUpdateRequest,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Partially update many support requests in a single transaction.
+
+    Each item carries an `id` and only the fields to change. Items that are
+    invalid or that name a support the user does not own are reported
+    individually; with `atomic` set they reject the whole batch.
+    """
+    if not user:
+        raise HTTPException(status_code=403, detail="Authentication required")
+    check_bulk_size(len(form_data.items))
+
+    try:
+        valid, errors = validate_bulk_items(
+            form_data.items, SupportBulkUpdateItem, partial=True
+        )
+
+        owned = set()
+        ids = [item.id for _, item in valid]
+        if ids:
+            owned = {
+                support_id
+                for (support_id,) in await run_in_db_executor(
+                    db.query(Support.id).filter(
+                        Support.id.in_(ids), Support.user_id == user.id
+                    ).all
+                )
+            }
+
+        now = datetime.now()
+        rows, keyword_updates, results = [], {}, list(errors)
+        for index, item in valid:
+            if item.id not in owned:
+                results.append(
+                    {"index": index, "id": item.id, "status": "error", "detail": "Support request not found"}
+                )
+                continue
+
+            values = item.model_dump(exclude_unset=True, exclude={"keywords"})
+            if "keywords" in item.model_fields_set:
+                keyword_updates[item.id] = keyword_rows(item.id, item.keywords)
+                values["keywords"] = None  # superseded by the keyword table
+            rows.append({**values, "updated_at": now})
+            results.append({"index": index, "id": item.id, "status": "updated"})
+
+        if form_data.atomic and len(rows) != len(form_data.items):
+            return JSONResponse(
+                status_code=422,
+                content=bulk_response(
+                    [result for result in results if result["status"] == "error"],
+                    "updated",
+                ),
+            )
+
+        if rows:
+            # ORM bulk UPDATE by primary key, batched by the set of columns
+            await run_in_db_executor(db.execute, update(Support), rows)
+            indexed = [
+                row["id"]
+                for row in rows
+                if row.keys() & {"title", "short_description", "learning_objective"}
+            ]
+            if indexed:
+                await run_in_db_executor(sync_search_index, db, indexed)
+            if keyword_updates:
+                await run_in_db_executor(
+                    delete_support_keywords, db, list(keyword_updates)
+                )
+                await run_in_db_executor(
+                    insert_keyword_rows,
+                    db,
+                    [row for values in keyword_updates.values() for row in values],
+                )
+            await run_in_db_executor(db.commit)
+
+        return bulk_response(results, "updated")
+
+    except Exception as e:
+        log.error(f"Error bulk updating support requests: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to update support requests: {str(e)}")
+
+
+@router.delete("/supports/bulk")
+async def bulk_delete_supports(
+    form_data: SupportBulkDeleteRequest,
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
+):
+    """
+    Delete many support requests and their files in a single transaction.
+
+    Ids that do not exist or are not owned by the user are reported
+    individually and left untouched.
+    """
+    if not user:
+        raise HTTPException(status_code=403, detail="Authentication required")
+    check_bulk_size(len(form_data.ids))
+
+    try:
+        ids = list(dict.fromkeys(form_data.ids))
+        owned = {
+            support_id
+            for (support_id,) in await run_in_db_executor(
+                db.query(Support.id).filter(
+                    Support.id.in_(ids), Support.user_id == user.id
+                ).all
+            )
+        } if ids else set()
+
+        if owned:
+            owned_ids = list(owned)
+
+            # Release the blobs referenced by the supports' files
+            file_paths = [
+                path
+                for (path,) in await run_in_db_executor(
+                    db.query(SupportFile.file_path).filter(
+                        SupportFile.support_id.in_(owned_ids)
+                    ).all
+                )
+            ]
+            orphaned = await run_in_db_executor(blob_store.release, db, file_paths)
+
+            await run_in_db_executor(
+                db.query(SupportFile).filter(SupportFile.support_id.in_(owned_ids)).delete,
+                synchronize_session=False,
+            )
+            await run_in_db_executor(delete_support_keywords, db, owned_ids)
+            await run_in_db_executor(remove_from_search_index, db, owned_ids)
+            await run_in_db_executor(
+                db.query(Support).filter(Support.id.in_(owned_ids)).delete,
+                synchronize_session=False,
+            )
+            await run_in_db_executor(db.commit)
+
+            # Remove blobs that are no longer referenced once the delete is durable
+            await run_in_db_executor(blob_store.remove_orphans, db, orphaned)
+            await run_in_db_executor(db.commit)
+
+        results = [
+            {"index": index, "id": support_id, "status": "deleted"}
+            if support_id in owned
+            else {"index": index, "id": support_id, "status": "error", "detail": "Support request not found"}
+            for index, support_id in enumerate(ids)
+        ]
+        return bulk_response(results, "deleted")
+
+    except Exception as e:
+        log.error(f"Error bulk deleting support requests: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to delete support requests: {str(e)}")
+
+
 @router.get("/supports/{support_id}")
 async def get_support_by_id(
     support_id: str,
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
     Get a support request by ID
     """
     try:
-        session = get_db_session()
-        
-        try:
-            if user:
-                support = session.query(Support).filter(
+        if user:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.user_id == user.id
-                ).first()
-            else:
-                support = session.query(Support).filter(
+                ).first
+            )
+        else:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.access_type == "Public"
-                ).first()
-            
-            if not support:
-                raise HTTPException(status_code=404, detail="Support request not found")
-                
-            return {
-                "id": support.id,
-                "user_id": support.user_id,
-                "title": support.title,
-                "short_description": support.short_description,
-                "subject": support.subject,
-                "custom_subject": support.custom_subject,
-                "course_id": support.course_id,
-                "learning_objective": support.learning_objective,
-                "learning_type": support.learning_type,
-                "level": support.level,
-                "content_language": support.content_language,
-                "estimated_duration": support.estimated_duration,
-                "access_type": support.access_type,
-                "keywords": support.keywords.split(",") if support.keywords else None,
-                "start_date": support.start_date,
-                "end_date": support.end_date,
-                "avatar_id": support.avatar_id,
-                "status": support.status,
-                "chat_id": support.chat_id,
-                "created_at": support.created_at.isoformat() if support.created_at else None,
-                "updated_at": support.updated_at.isoformat() if support.updated_at else None
-            }
-        finally:
-            session.close()
+                ).first
+            )
+
+        if not support:
+            raise HTTPException(status_code=404, detail="Support request not found")
+
+        keywords = await run_in_db_executor(load_support_keywords, db, [support.id])
+
+        return support_json_response(
+            serialize_support(support, keywords.get(support.id))
+        )
             
     except HTTPException:
         raise
@@ -321,7 +990,8 @@ async def get_support_by_id(
 async def update_support_chat_id(
     support_id: str,
     chat_id: Optional[str] = None,
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
     Update the chat_id of a support request.
@@ -333,41 +1003,40 @@ async def update_support_chat_id(
         raise HTTPException(status_code=400, detail="chat_id query parameter is required")
     
     try:
-        session = get_db_session()
-        
-        try:
-            if user:
-                support = session.query(Support).filter(
+        if user:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.user_id == user.id
-                ).first()
-            else:
-                support = session.query(Support).filter(
+                ).first
+            )
+        else:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.access_type == "Public"
-                ).first()
-            
-            if not support:
-                log.warning(f"Support {support_id} not found for user {user.id if user else 'anonymous'}")
-                raise HTTPException(status_code=404, detail="Support request not found")
-            
-            log.info(f"Updating support {support_id} - Current chat_id: {support.chat_id}, New chat_id: {chat_id}")
-            
-            # Update the chat_id
-            support.chat_id = chat_id
-            support.updated_at = datetime.now()
-            session.commit()
-            
-            log.info(f"Successfully updated support {support_id} with chat_id {chat_id}")
-            
-            return {
-                "id": support.id,
-                "chat_id": support.chat_id,
-                "status": "success",
-                "message": "Chat ID updated successfully"
-            }
-        finally:
-            session.close()
+                ).first
+            )
+
+        if not support:
+            log.warning(f"Support {support_id} not found for user {user.id if user else 'anonymous'}")
+            raise HTTPException(status_code=404, detail="Support request not found")
+
+        log.info(f"Updating support {support_id} - Current chat_id: {support.chat_id}, New chat_id: {chat_id}")
+
+        # Update the chat_id
+        support.chat_id = chat_id
+        support.updated_at = datetime.now()
+        await run_in_db_executor(db.commit)
+
+        log.info(f"Successfully updated support {support_id} with chat_id {chat_id}")
+
+        return {
+            "id": support.id,
+            "chat_id": support.chat_id,
+            "status": "success",
+            "message": "Chat ID updated successfully"
+        }
             
     except HTTPException:
         raise
@@ -380,78 +1049,54 @@ async def update_support_chat_id(
 async def update_support(
     support_id: str,
     support_data: SupportCreateRequest,
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
     Update an existing support request
     """
     try:
         # Verify user has permission to update this support
-        session = get_db_session()
-        
-        try:
-            if user:
-                support = session.query(Support).filter(
+        if user:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.user_id == user.id
-                ).first()
-            else:
-                raise HTTPException(status_code=403, detail="Authentication required")
-            
-            if not support:
-                raise HTTPException(status_code=404, detail="Support request not found")
-            
-            # Prepare keywords
-            keywords_str = ",".join(support_data.keywords) if support_data.keywords else None
-            
-            # Update support fields
-            support.title = support_data.title
-            support.short_description = support_data.short_description
-            support.subject = support_data.subject
-            support.custom_subject = support_data.custom_subject
-            support.course_id = support_data.course_id
-            support.learning_objective = support_data.learning_objective
-            support.learning_type = support_data.learning_type
-            support.level = support_data.level
-            support.content_language = support_data.content_language
-            support.estimated_duration = support_data.estimated_duration
-            support.access_type = support_data.access_type
-            support.keywords = keywords_str
-            support.start_date = support_data.start_date
-            support.end_date = support_data.end_date
-            support.avatar_id = support_data.avatar_id
-            support.updated_at = datetime.now()
-            
-            session.commit()
-            
-            # Create response object
-            response = SupportResponse(
-                id=support.id,
-                user_id=support.user_id,
-                title=support.title,
-                short_description=support.short_description,
-                subject=support.subject,
-                custom_subject=support.custom_subject,
-                course_id=support.course_id,
-                learning_objective=support.learning_objective,
-                learning_type=support.learning_type,
-                level=support.level,
-                content_language=support.content_language,
-                estimated_duration=support.estimated_duration,
-                access_type=support.access_type,
-                keywords=support.keywords.split(",") if support.keywords else None,
-                start_date=support.start_date,
-                end_date=support.end_date,
-                avatar_id=support.avatar_id,
-                status=support.status,
-                chat_id=support.chat_id,
-                created_at=support.created_at,
-                updated_at=support.updated_at
+                ).first
             )
-            
-            return response
-        finally:
-            session.close()
+        else:
+            raise HTTPException(status_code=403, detail="Authentication required")
+
+        if not support:
+            raise HTTPException(status_code=404, detail="Support request not found")
+
+        # Prepare keywords
+        keywords = clean_keywords(support_data.keywords)
+
+        # Update support fields
+        support.title = support_data.title
+        support.short_description = support_data.short_description
+        support.subject = support_data.subject
+        support.custom_subject = support_data.custom_subject
+        support.course_id = support_data.course_id
+        support.learning_objective = support_data.learning_objective
+        support.learning_type = support_data.learning_type
+        support.level = support_data.level
+        support.content_language = support_data.content_language
+        support.estimated_duration = support_data.estimated_duration
+        support.access_type = support_data.access_type
+        support.start_date = support_data.start_date
+        support.end_date = support_data.end_date
+        support.avatar_id = support_data.avatar_id
+        support.keywords = None  # superseded by the keyword table
+        support.updated_at = datetime.now()
+
+        await run_in_db_executor(set_support_keywords, db, support.id, keywords)
+        await run_in_db_executor(sync_search_index, db, [support.id])
+
+        await run_in_db_executor(db.commit)
+
+        return support_json_response(serialize_support(support, keywords))
             
     except HTTPException:
         raise
@@ -462,50 +1107,54 @@ async def update_support(
 @router.delete("/supports/{support_id}")
 async def delete_support(
     support_id: str,
-    user = Depends(get_verified_user)
+    user = Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     """
     Delete a support request
     """
     try:
         # Verify user has permission to delete this support
-        session = get_db_session()
-        
-        try:
-            if user:
-                support = session.query(Support).filter(
+        if user:
+            support = await run_in_db_executor(
+                db.query(Support).filter(
                     Support.id == support_id,
                     Support.user_id == user.id
-                ).first()
-            else:
-                raise HTTPException(status_code=403, detail="Authentication required")
-            
-            if not support:
-                raise HTTPException(status_code=404, detail="Support request not found")
-            
-            # First delete any associated files
-            files = session.query(SupportFile).filter(
-                SupportFile.support_id == support_id
-            ).all()
-            
-            # Delete physical files
-            for file in files:
-                try:
-                    if os.path.exists(file.file_path):
-                        os.remove(file.file_path)
-                except Exception as e:
-                    log.warning(f"Error deleting file {file.file_path}: {str(e)}")
-            
-            # Delete file records
-            session.query(SupportFile).filter(SupportFile.support_id == support_id).delete()
-            
-            # Delete the support request
-            session.delete(support)
-            session.commit()
-            
-            return JSONResponse(content={"status": "success", "message": "Support request deleted"})
-        finally:
-            session.close()
+                ).first
+            )
+        else:
+            raise HTTPException(status_code=403, detail="Authentication required")
+
+        if not support:
+            raise HTTPException(status_code=404, detail="Support request not found")
+
+        # Release the blobs referenced by the support's files
+        file_paths = [
+            path
+            for (path,) in await run_in_db_executor(
+                db.query(SupportFile.file_path).filter(
+                    SupportFile.support_id == support_id
+                ).all
+            )
+        ]
+        orphaned = await run_in_db_executor(blob_store.release, db, file_paths)
+
+        # Delete file records
+        await run_in_db_executor(
+            db.query(SupportFile).filter(SupportFile.support_id == support_id).delete
+        )
+        await run_in_db_executor(delete_support_keywords, db, [support_id])
+        await run_in_db_executor(remove_from_search_index, db, [support_id])
+
+        # Delete the support request
+        db.delete(support)
+        await run_in_db_executor(db.commit)
+
+        # Remove blobs that are no longer referenced once the delete is durable
+        await run_in_db_executor(blob_store.remove_orphans, db, orphaned)
+        await run_in_db_executor(db.commit)
+
+        return JSONResponse(content={"status": "success", "message": "Support request deleted"})
             
     except HTTPException:
         raise
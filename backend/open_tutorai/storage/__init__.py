@@ -0,0 +1 @@
+# OpenTutorAI storage initialization
@@ -0,0 +1,175 @@
+"""
+Content-addressed blob store for support files
+
+Files are stored once per SHA-256 under a hash-sharded layout
+(`<root>/ab/cd/abcd...`). Each blob has a SupportBlob row whose ref_count is
+the number of SupportFile rows pointing at it, so identical uploads share one
+copy on disk and a blob is only removed once nothing references it.
+
+The blob row doubles as a lock on its file. acquire() adds a new row before
+moving the file into place, and remove_orphans() claims a released blob by
+inserting a placeholder row under the same key before unlinking it, so an
+upload and a delete of the same content wait on each other instead of one
+unlinking the file the other just stored.
+
+All methods taking a session are blocking and must run on the database
+executor. They never commit; the caller owns the transaction.
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from open_tutorai.models.database import SupportBlob
+
+log = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def hash_file(path: str) -> str:
+    """Compute the SHA-256 of a file without loading it into memory."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _unlink_quietly(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+INSERT_IGNORE = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class BlobStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def acquire(
+        self,
+        db: Session,
+        sha256: str,
+        size: int,
+        tmp_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Take a reference on the blob for `sha256` and return its path.
+
+        If the blob already exists its ref_count is incremented and `tmp_path`
+        (a duplicate copy) is discarded. Otherwise a new blob row is flushed
+        and `tmp_path` moved into place. Returns None when the blob does not
+        exist and no `tmp_path` was given, i.e. an instant upload miss.
+
+        The flush raises IntegrityError when a concurrent upload of the same
+        content committed its row first; `tmp_path` is then still in place,
+        and the caller can roll back and acquire again to reference that blob.
+        """
+        blob_path = self.path_for(sha256)
+
+        updated = (
+            db.query(SupportBlob)
+            .filter(SupportBlob.sha256 == sha256)
+            .update(
+                {SupportBlob.ref_count: SupportBlob.ref_count + 1},
+                synchronize_session=False,
+            )
+        )
+        if updated:
+            if tmp_path:
+                _unlink_quietly(tmp_path)
+            return blob_path
+
+        if tmp_path is None:
+            return None
+
+        # The row goes in first: it waits for a remove_orphans() claim on the
+        # same blob to commit, so the file cannot be unlinked once moved
+        db.add(
+            SupportBlob(
+                sha256=sha256,
+                file_path=blob_path,
+                file_size=size,
+                ref_count=1,
+                created_at=datetime.now(),
+            )
+        )
+        db.flush()
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(tmp_path, blob_path)
+        return blob_path
+
+    def release(self, db: Session, file_paths: List[str]) -> List[str]:
+        """
+        Drop one reference per entry of `file_paths`.
+
+        Returns the paths that are no longer referenced. Pass them to
+        remove_orphans() once the transaction has committed. Paths that are
+        not managed by the store (uploads predating it) belong to a single
+        row and are returned as-is.
+        """
+        orphaned = []
+        for path in file_paths:
+            blob = (
+                db.query(SupportBlob)
+                .filter(SupportBlob.file_path == path)
+                .with_for_update()
+                .first()
+            )
+            if blob is None:
+                orphaned.append(path)
+                continue
+
+            blob.ref_count -= 1
+            if blob.ref_count <= 0:
+                db.delete(blob)
+                orphaned.append(path)
+        return orphaned
+
+    def remove_orphans(self, db: Session, paths: List[str]):
+        """
+        Unlink released paths that are still unreferenced; commit afterwards.
+
+        Each blob is claimed with a placeholder row first. The insert waits
+        for an upload of the same content whose row is not committed yet, and
+        does nothing when there is a row, in which case the file is kept.
+        Until the caller commits, uploads of that content wait on the claim.
+        """
+        insert_ignore = INSERT_IGNORE.get(db.get_bind().dialect.name)
+        for path in paths:
+            sha256 = os.path.basename(path)
+            if path == self.path_for(sha256):
+                if insert_ignore is not None:
+                    claim = insert_ignore(SupportBlob).values(
+                        sha256=sha256,
+                        file_path=path,
+                        file_size=0,
+                        ref_count=0,
+                        created_at=datetime.now(),
+                    )
+                    if not db.execute(claim.on_conflict_do_nothing()).rowcount:
+                        continue
+                    db.query(SupportBlob).filter(SupportBlob.sha256 == sha256).delete(
+                        synchronize_session=False
+                    )
+                elif db.query(SupportBlob.sha256).filter(SupportBlob.sha256 == sha256).first():
+                    # Without ON CONFLICT only committed rows can be checked
+                    continue
+            # Paths outside the store predate it and belonged to the deleted row
+            try:
+                _unlink_quietly(path)
+            except OSError as e:
+                log.warning(f"Error deleting file {path}: {str(e)}")
@@ -0,0 +1,59 @@
+import json
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline
+
+gemini = load_gemini_pipeline()
+
+REPLY = {
+    "response": 'Let\'s say "hello" \\ to the chain rule.',
+    "animation": {"facial_expression": 1, "head_movement": 2},
+    "glbAnimation": "M_Talking_Variations_001",
+    "glbAnimationCategory": "expression",
+}
+
+
+def parse(fragments, error=None):
+    parser = gemini.AvatarStreamParser()
+    outputs = [parser.feed(fragment) for fragment in fragments]
+    return outputs, "".join(outputs) + parser.close(error)
+
+
+def test_one_character_at_a_time():
+    text = json.dumps(REPLY)
+    _, output = parse(list(text))
+    assert json.loads(output) == REPLY
+
+
+def test_code_fence_is_stripped():
+    text = "```json\n" + json.dumps(REPLY, indent=2) + "\n```"
+    _, output = parse([text[i : i + 7] for i in range(0, len(text), 7)])
+    assert json.loads(output) == REPLY
+
+
+def test_response_is_streamed_before_the_reply_ends():
+    outputs, _ = parse(['{"response": "Hel', 'lo", "animation": {"facial_', 'expression": 1}}'])
+    assert outputs[0] == '{"response": "Hel'
+    assert outputs[1] == 'lo"'
+    # Other fields are held back until their value is complete
+    assert outputs[2] == ', "animation": {"facial_expression": 1}}'
+
+
+def test_text_that_is_not_json_passes_through():
+    outputs, output = parse(["Sorry, ", "I cannot help with that."])
+    assert output == "Sorry, I cannot help with that."
+    assert outputs[1] == "I cannot help with that."
+
+
+def test_failed_stream_still_parses():
+    _, output = parse(['{"response": "Half a sent', 'ence", "animation": {"head'], "timeout")
+    assert json.loads(output) == {"response": "Half a sentence", "error": "timeout"}
+
+
+def test_truncated_response_is_closed():
+    _, output = parse(['{"response": "Cut off \\'])
+    assert json.loads(output) == {"response": "Cut off \\"}
+
+
+def test_error_before_any_output_is_plain_text():
+    _, output = parse([], "upstream unavailable")
+    assert output == "Error: upstream unavailable"
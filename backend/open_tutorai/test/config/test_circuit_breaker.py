@@ -0,0 +1,67 @@
+import pytest
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline
+
+gemini = load_gemini_pipeline()
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.acquire()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures():
+    breaker = gemini.CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    fail(breaker, 2)
+    assert breaker.state == "closed"
+    fail(breaker, 1)
+    assert breaker.state == "open"
+
+    with pytest.raises(gemini.UpstreamUnavailable) as e:
+        breaker.acquire()
+    assert e.value.status_code == 503
+    assert 29 < e.value.retry_after <= 30
+    assert e.value.headers == {"Retry-After": "30"}
+
+
+def test_success_resets_the_failure_count():
+    breaker = gemini.CircuitBreaker(failure_threshold=3)
+    fail(breaker, 2)
+    breaker.acquire()
+    breaker.record_success()
+    fail(breaker, 2)
+    assert breaker.state == "closed"
+    assert breaker.retry_after() is None
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = gemini.CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    fail(breaker, 1)
+    assert breaker.state == "open"
+
+    breaker.acquire()
+    assert breaker.state == "half-open"
+    with pytest.raises(gemini.UpstreamUnavailable):
+        breaker.acquire()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.acquire()
+
+
+def test_failed_probe_opens_again():
+    breaker = gemini.CircuitBreaker(failure_threshold=5, reset_timeout=0.0)
+    fail(breaker, 5)
+    breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.failures == 6
+
+
+def test_abandoned_probe_frees_the_slot():
+    breaker = gemini.CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    fail(breaker, 1)
+    breaker.acquire()
+    breaker.abandon()
+    breaker.acquire()
@@ -0,0 +1,111 @@
+import json
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline
+
+gemini = load_gemini_pipeline()
+
+
+def turns(count, size=400):
+    """Alternating student and tutor turns of about size / 4 tokens each."""
+    return [
+        ("user" if i % 2 == 0 else "model", f"{i:03d}" + "x" * (size - 3))
+        for i in range(count)
+    ]
+
+
+def tokens(contents):
+    return sum(
+        gemini.estimate_tokens(part["text"]) for content in contents for part in content["parts"]
+    )
+
+
+class Summarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, summary, dropped):
+        self.calls.append((summary, dropped))
+        return f"summary of {len(dropped)} turns after {summary}"
+
+
+def test_turns_within_the_budget_are_sent_as_they_are():
+    summarize = Summarizer()
+    builder = gemini.ContextBuilder(budget_tokens=1000, summarize=summarize)
+    contents = builder.build("chat", turns(4))
+    assert [content["role"] for content in contents] == ["user", "model", "user", "model"]
+    assert contents[0]["parts"][0]["text"] == turns(4)[0][1]
+    assert not summarize.calls
+
+
+def test_older_turns_are_dropped_to_half_the_budget():
+    builder = gemini.ContextBuilder(budget_tokens=500)
+    history = turns(10)
+    contents = builder.build("chat", history)
+    assert tokens(contents) <= 250
+    # The most recent turns are the ones kept
+    assert contents[-1]["parts"][-1]["text"] == history[-1][1]
+
+
+def test_dropped_turns_are_summarized_once():
+    summarize = Summarizer()
+    builder = gemini.ContextBuilder(budget_tokens=500, summarize=summarize)
+    history = turns(10)
+    contents = builder.build("chat", history)
+    assert len(summarize.calls) == 1
+    summary, dropped = summarize.calls[0]
+    assert summary is None and dropped == history[:8]
+    assert contents[0]["parts"][0]["text"].endswith("summary of 8 turns after None")
+
+    # The next turn fits next to the cached summary without a new one
+    builder.build("chat", turns(11))
+    assert len(summarize.calls) == 1
+
+    # Once the recent turns outgrow the budget again, only they are summarized
+    builder.build("chat", turns(14))
+    assert len(summarize.calls) == 2
+    summary, dropped = summarize.calls[1]
+    assert summary == "summary of 8 turns after None"
+    assert dropped[0] == turns(14)[8]
+
+
+def test_an_edited_conversation_starts_over():
+    summarize = Summarizer()
+    builder = gemini.ContextBuilder(budget_tokens=500, summarize=summarize)
+    builder.build("chat", turns(10))
+    edited = [("user", "A different opening")] + turns(10)[1:]
+    builder.build("chat", edited)
+    assert summarize.calls[1][0] is None
+
+
+def test_summarizer_given_per_call_is_used_instead():
+    default, caller = Summarizer(), Summarizer()
+    builder = gemini.ContextBuilder(budget_tokens=500, summarize=default)
+    builder.build("chat", turns(10), summarize=caller)
+    assert not default.calls and len(caller.calls) == 1
+
+
+def test_without_a_summarizer_a_per_call_one_is_ignored():
+    caller = Summarizer()
+    builder = gemini.ContextBuilder(budget_tokens=500)
+    builder.build("chat", turns(10), summarize=caller)
+    assert not caller.calls
+
+
+def test_tutor_replies_are_sent_without_animation_fields():
+    reply = json.dumps(
+        {"response": "Photosynthesis makes sugar.", "animation": {"facial_expression": 1}}
+    )
+    builder = gemini.ContextBuilder(budget_tokens=1000)
+    contents = builder.build("chat", [("user", "What is photosynthesis?"), ("model", reply)])
+    assert contents[1] == {"role": "model", "parts": [{"text": "Photosynthesis makes sugar."}]}
+
+
+def test_no_budget_sends_no_history():
+    assert gemini.ContextBuilder(budget_tokens=0).build("chat", turns(4)) == []
+
+
+def test_least_recent_chats_are_forgotten():
+    builder = gemini.ContextBuilder(budget_tokens=500, summarize=Summarizer(), max_chats=2)
+    for chat_id in ("a", "b", "c"):
+        builder.build(chat_id, turns(10))
+    assert list(builder._chats) == ["b", "c"]
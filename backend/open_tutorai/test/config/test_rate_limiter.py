@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from open_tutorai.benchmarks.gemini_stub import load_gemini_pipeline, make_pipeline
+
+gemini = load_gemini_pipeline()
+
+KEY = ("student", "mentor")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_refill():
+    clock = Clock()
+    limiter = gemini.RateLimiter(requests_per_minute=30, burst=3, clock=clock)
+    for _ in range(3):
+        limiter.acquire(KEY)
+    with pytest.raises(gemini.RateLimited) as e:
+        limiter.acquire(KEY)
+    assert e.value.status_code == 429
+    assert e.value.retry_after == pytest.approx(2.0)
+    assert limiter.rejected == 1
+
+    clock.now += 2.0
+    limiter.acquire(KEY)
+
+
+def test_limits_are_per_user_and_avatar():
+    limiter = gemini.RateLimiter(requests_per_minute=30, burst=1, clock=Clock())
+    limiter.acquire(KEY)
+    limiter.acquire(("student", "scholar"))
+    limiter.acquire(("other", "mentor"))
+    with pytest.raises(gemini.RateLimited):
+        limiter.acquire(KEY)
+
+
+def test_token_debt_blocks_until_repaid():
+    clock = Clock()
+    limiter = gemini.RateLimiter(requests_per_minute=0, tokens_per_hour=3600, clock=clock)
+    limiter.acquire(KEY)
+    limiter.charge(KEY, 4600)
+
+    quota = limiter.check(KEY)
+    assert not quota["allowed"]
+    assert quota["tokens_remaining"] == -1000
+    assert quota["requests_remaining"] is None
+    with pytest.raises(gemini.RateLimited, match="token limit"):
+        limiter.acquire(KEY)
+
+    # One token a second: the debt and one token for the call
+    clock.now += 1001
+    limiter.acquire(KEY)
+
+
+def test_check_spends_nothing():
+    limiter = gemini.RateLimiter(requests_per_minute=30, burst=2, clock=Clock())
+    for _ in range(5):
+        assert limiter.check(KEY)["requests_remaining"] == 2
+    limiter.acquire(KEY)
+    assert limiter.check(KEY)["requests_remaining"] == 1
+
+
+def test_no_limits():
+    limiter = gemini.RateLimiter(requests_per_minute=0, tokens_per_hour=0, clock=Clock())
+    assert not limiter.enabled
+    for _ in range(100):
+        limiter.acquire(KEY)
+    limiter.charge(KEY, 10**9)
+    assert limiter.stats()["buckets"] == 0
+
+
+def test_refilled_buckets_are_forgotten():
+    clock = Clock()
+    limiter = gemini.RateLimiter(requests_per_minute=60, burst=5, clock=clock)
+    limiter.acquire(KEY)
+    assert limiter.stats()["buckets"] == 1
+    clock.now += limiter.PRUNE_INTERVAL
+    limiter.acquire(("other", "mentor"))
+    assert limiter.stats()["buckets"] == 1
+
+
+class FailingStore(gemini.MemoryUsageStore):
+    def __init__(self):
+        super().__init__()
+        self.fail = True
+
+    def write(self, rows):
+        if self.fail:
+            raise OSError("disk full")
+        super().write(rows)
+
+
+def test_ledger_aggregates_calls():
+    ledger = gemini.UsageLedger(gemini.MemoryUsageStore())
+    ledger.record("student", "mentor", 100, 20, 0.5)
+    ledger.record("student", "mentor", 50, 10, 1.5)
+    ledger.record("student", "mentor", rejected=True)
+    ledger.record("student", "scholar", 1, 1, 0.1)
+    ledger.record("other", "mentor", 1, 1, 0.1)
+
+    totals = ledger.totals("student")
+    assert totals["mentor"] == {
+        "requests": 2,
+        "rejected": 1,
+        "prompt_tokens": 150,
+        "response_tokens": 30,
+        "latency_ms": pytest.approx(2000.0),
+        "max_latency_ms": pytest.approx(1500.0),
+    }
+    assert totals["scholar"]["requests"] == 1
+
+
+def test_ledger_totals_include_flushed_and_pending_rows():
+    store = gemini.MemoryUsageStore()
+    ledger = gemini.UsageLedger(store)
+    ledger.record("student", "mentor", 100, 20, 0.5)
+    ledger.flush()
+    ledger.record("student", "mentor", 100, 20, 0.2)
+    ledger.flush()
+    ledger.flush()
+    ledger.record("student", "mentor", 100, 20, 0.1)
+
+    assert store.writes == 2
+    assert ledger.flushes == 2
+    totals = ledger.totals("student")["mentor"]
+    assert totals["requests"] == 3
+    assert totals["prompt_tokens"] == 300
+    assert totals["max_latency_ms"] == pytest.approx(500.0)
+
+
+def test_ledger_keeps_rows_the_store_failed_to_write():
+    store = FailingStore()
+    ledger = gemini.UsageLedger(store)
+    ledger.record("student", "mentor", 100, 20, 0.5)
+    ledger.flush()
+    assert ledger.flushes == 0
+
+    ledger.record("student", "mentor", 100, 20, 0.5)
+    store.fail = False
+    ledger.flush()
+    assert store.totals("student") and ledger.flushes == 1
+    assert ledger.totals("student")["mentor"]["requests"] == 2
+
+
+def test_summary_calls_count_against_the_user():
+    pipeline = asyncio.run(
+        make_pipeline(
+            AVATAR_PROVIDERS="mock",
+            AVATAR_RATE_LIMIT_PER_MINUTE=1,
+            AVATAR_RATE_LIMIT_BURST=100,
+            GEMINI_CONTEXT_TOKENS=200,
+            GEMINI_CONTEXT_SUMMARY=True,
+        )
+    )
+    try:
+        messages = []
+        for turn in range(6):
+            messages.append({"role": "user", "content": f"Question {turn} " + "x" * 300})
+            body = {"user": {"id": "student"}, "chat_id": "chat", "avatar_type": "mentor"}
+            reply = pipeline.pipe(messages[-1]["content"], pipeline.model, list(messages), body)
+            messages.append({"role": "assistant", "content": reply})
+        summaries = pipeline.context.summaries_made
+        totals = pipeline.usage.totals("student")["mentor"]
+        quota = pipeline.check_quota("student", "mentor")
+    finally:
+        asyncio.run(pipeline.on_shutdown())
+
+    assert summaries > 0
+    assert totals["requests"] == 6 + summaries
+    assert quota["requests_remaining"] == 100 - 6 - summaries
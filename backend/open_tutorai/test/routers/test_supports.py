@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("open_webui")
+
+from fastapi import HTTPException
+
+from open_tutorai.routers import supports
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456)
+    cursor = supports.encode_support_cursor(created_at, "id|with|bars")
+    assert "=" not in cursor
+    assert supports.decode_support_cursor(cursor) == (created_at, "id|with|bars")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm90LWEtZGF0ZXxpZA", "b2Zmc2V0fDEw"])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        supports.decode_support_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_offset_cursor_round_trip():
+    assert supports.decode_offset_cursor(supports.encode_offset_cursor(40)) == 40
+    keyset = supports.encode_support_cursor(datetime(2025, 1, 1), "a")
+    for cursor in (keyset, supports.encode_offset_cursor(-1)):
+        with pytest.raises(HTTPException):
+            supports.decode_offset_cursor(cursor)
+
+
+def test_bulk_create_items_are_validated_one_by_one():
+    items = [
+        {"title": "Fractions", "subject": "Math", "level": "Beginner"},
+        {"title": "Verbs", "subject": "English"},
+        {"subject": "Science", "level": "Advanced"},
+        "not an object",
+        {"title": "Atoms", "subject": "Science", "level": "Advanced", "keywords": "atoms"},
+    ]
+    valid, errors = supports.validate_bulk_items(items, supports.SupportCreateRequest)
+
+    assert [index for index, _ in valid] == [0]
+    assert valid[0][1].title == "Fractions"
+    assert [error["index"] for error in errors] == [1, 2, 3, 4]
+    assert all(error["status"] == "error" for error in errors)
+    assert errors[0]["detail"] == "Fields cannot be null: level"
+    assert errors[1]["detail"][0]["loc"] == ("title",)
+
+
+def test_bulk_update_only_checks_the_fields_sent():
+    items = [
+        {"id": "a", "short_description": "Shorter"},
+        {"id": "b", "title": None},
+        {"title": "No id"},
+    ]
+    valid, errors = supports.validate_bulk_items(
+        items, supports.SupportBulkUpdateItem, partial=True
+    )
+
+    assert [(index, item.id) for index, item in valid] == [(0, "a")]
+    assert valid[0][1].model_fields_set == {"id", "short_description"}
+    assert errors[0] == {
+        "index": 1,
+        "id": "b",
+        "status": "error",
+        "detail": "Fields cannot be null: title",
+    }
+    assert errors[1]["index"] == 2 and errors[1]["id"] is None
+
+
+def test_bulk_size_is_limited():
+    supports.check_bulk_size(supports.SUPPORT_BULK_MAX_ITEMS)
+    with pytest.raises(HTTPException) as e:
+        supports.check_bulk_size(supports.SUPPORT_BULK_MAX_ITEMS + 1)
+    assert e.value.status_code == 413
+
+
+def test_bulk_response_counts_and_orders_results():
+    results = [
+        {"index": 2, "status": "created"},
+        {"index": 0, "status": "error"},
+        {"index": 1, "status": "created"},
+    ]
+    response = supports.bulk_response(results, "created")
+    assert [result["index"] for result in response["results"]] == [0, 1, 2]
+    assert response["created"] == 2 and response["failed"] == 1
@@ -0,0 +1 @@
+# OpenTutorAI utilities
@@ -0,0 +1,130 @@
+"""
+Changelog served by /api/changelog
+
+CHANGELOG.md is compiled to JSON when the package is built (see
+hatch_build.py), so a worker reads one small JSON file, and only when the
+changelog is first requested. Without a compiled file, or when CHANGELOG.md
+has changed since it was compiled, the markdown is parsed instead, once per
+process. The response body is serialized once as well.
+
+Only the standard library is imported up front so the build hook can load
+this module on its own; markdown and BeautifulSoup are imported when the
+markdown has to be parsed.
+"""
+import hashlib
+import json
+import pkgutil
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Tuple
+
+OPEN_TUTORAI_DIR = Path(__file__).resolve().parents[1]
+BASE_DIR = OPEN_TUTORAI_DIR.parents[1]  # the path containing the backend/
+
+CHANGELOG_PATH = BASE_DIR / "CHANGELOG.md"
+COMPILED_CHANGELOG_PATH = OPEN_TUTORAI_DIR / "changelog.json"
+
+# Versions returned by /api/changelog, newest first
+CHANGELOG_VERSIONS = 5
+
+
+# Function to parse each section
+def parse_section(section):
+    items = []
+    for li in section.find_all("li"):
+        # Extract raw HTML string
+        raw_html = str(li)
+
+        # Extract text without HTML tags
+        text = li.get_text(separator=" ", strip=True)
+
+        # Split into title and content
+        parts = text.split(": ", 1)
+        title = parts[0].strip() if len(parts) > 1 else ""
+        content = parts[1].strip() if len(parts) > 1 else text
+
+        items.append({"title": title, "content": content, "raw": raw_html})
+    return items
+
+
+def parse_changelog(changelog_content: str) -> dict:
+    """Versions of a Keep a Changelog markdown file, with their date and sections."""
+    import markdown
+    from bs4 import BeautifulSoup
+
+    # Convert markdown content to HTML
+    html_content = markdown.markdown(changelog_content)
+
+    # Parse the HTML content
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    # Initialize JSON structure
+    changelog_json = {}
+
+    # Iterate over each version
+    for version in soup.find_all("h2"):
+        version_number = version.get_text().strip().split(" - ")[0][1:-1]  # Remove brackets
+        date = version.get_text().strip().split(" - ")[1]
+
+        version_data = {"date": date}
+
+        # Find the next sibling that is a h3 tag (section title)
+        current = version.find_next_sibling()
+
+        while current and current.name != "h2":
+            if current.name == "h3":
+                section_title = current.get_text().lower()  # e.g., "added", "fixed"
+                section_items = parse_section(current.find_next_sibling("ul"))
+                version_data[section_title] = section_items
+
+            # Move to the next element
+            current = current.find_next_sibling()
+
+        changelog_json[version_number] = version_data
+
+    return changelog_json
+
+
+def read_changelog_markdown() -> str:
+    try:
+        return CHANGELOG_PATH.read_text(encoding="utf8")
+    except OSError:
+        return (pkgutil.get_data("open_tutorai", "CHANGELOG.md") or b"").decode()
+
+
+def compile_changelog(
+    source: Path = CHANGELOG_PATH, target: Path = COMPILED_CHANGELOG_PATH
+) -> dict:
+    """Parse the markdown changelog and write it to `target` as JSON."""
+    changelog = parse_changelog(source.read_text(encoding="utf8"))
+    target.write_text(json.dumps(changelog, ensure_ascii=False), encoding="utf8")
+    return changelog
+
+
+def _compiled_is_current() -> bool:
+    try:
+        compiled = COMPILED_CHANGELOG_PATH.stat().st_mtime
+    except OSError:
+        return False
+    try:
+        # In a source checkout an edited CHANGELOG.md wins over a stale build
+        return CHANGELOG_PATH.stat().st_mtime <= compiled
+    except OSError:
+        return True
+
+
+@lru_cache(maxsize=1)
+def load_changelog() -> dict:
+    """The changelog by version, from the compiled JSON when it is current."""
+    if _compiled_is_current():
+        return json.loads(COMPILED_CHANGELOG_PATH.read_text(encoding="utf8"))
+    return parse_changelog(read_changelog_markdown())
+
+
+@lru_cache(maxsize=1)
+def changelog_response() -> Tuple[bytes, str]:
+    """The /api/changelog JSON body for the latest versions, and its ETag."""
+    latest = dict(islice(load_changelog().items(), CHANGELOG_VERSIONS))
+    body = json.dumps(latest, ensure_ascii=False).encode("utf8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
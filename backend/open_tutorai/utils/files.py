@@ -0,0 +1,93 @@
+"""
+File serving helpers for OpenTutorAI
+
+Responses are built on Starlette's FileResponse, which handles Range/If-Range
+requests and uses the ASGI pathsend extension for zero-copy transfers when the
+server supports it. Behind nginx, setting an accel-redirect prefix hands the
+transfer (sendfile, ranges) to the proxy entirely.
+"""
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+# Clients may keep a copy but must revalidate it, which is a cheap 304
+FILE_CACHE_CONTROL = "private, no-cache"
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the file validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+async def serve_file(
+    request: Request,
+    path: str,
+    filename: str,
+    media_type: Optional[str] = None,
+    etag: Optional[str] = None,
+    inline: bool = True,
+    root: Optional[str] = None,
+    accel_redirect_prefix: Optional[str] = None,
+) -> Response:
+    """
+    Serve `path` with validators, conditional and Range request support.
+
+    `etag` should be a strong validator such as the content hash; when it is
+    omitted one is derived from the file's mtime and size. When
+    `accel_redirect_prefix` is set, the response only carries an
+    X-Accel-Redirect to `prefix + path relative to root` for nginx to serve.
+    """
+    stat_result = await run_in_threadpool(os.stat, path)
+    if etag is None:
+        etag = f"{int(stat_result.st_mtime)}-{stat_result.st_size}"
+    etag = f'"{etag}"'
+
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": FILE_CACHE_CONTROL,
+    }
+
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if accel_redirect_prefix:
+        relative_path = os.path.relpath(path, root or os.path.dirname(path))
+        headers["x-accel-redirect"] = (
+            f"{accel_redirect_prefix.rstrip('/')}/{relative_path}"
+        )
+        disposition = "inline" if inline else "attachment"
+        quoted_filename = quote(filename)
+        if quoted_filename != filename:
+            headers["content-disposition"] = (
+                f"{disposition}; filename*=utf-8''{quoted_filename}"
+            )
+        else:
+            headers["content-disposition"] = f'{disposition}; filename="{filename}"'
+        return Response(media_type=media_type, headers=headers)
+
+    return FileResponse(
+        path,
+        filename=filename,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat_result,
+        content_disposition_type="inline" if inline else "attachment",
+    )
@@ -0,0 +1,119 @@
+"""
+Password hashing off the event loop
+
+bcrypt takes 100-300ms of CPU per hash on purpose. Called from an async
+handler, it stalls every other request for that long, so a burst of signups
+shows up as latency on every route. PasswordHasher runs the hashes on a
+small dedicated thread pool instead. bcrypt releases the GIL while it
+hashes, so threads run hashes in parallel without a process pool's startup
+and pickling cost.
+
+Admission is bounded: once `workers` hashes are running and `max_queue` are
+waiting, further requests get a 503 with a Retry-After estimated from the
+queue and the recent hash time. They are not left to pile up until their
+clients time out. snapshot() reports the queue depth, waits and rejections.
+"""
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from fastapi import HTTPException, status
+
+
+class PasswordHasher:
+    def __init__(self, hash_fn: Callable[[str], str], workers: int, max_queue: int):
+        self.hash_fn = hash_fn
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tutorai-hash"
+        )
+        self._lock = threading.Lock()
+        self.pending = 0  # admitted and not finished: running plus queued
+        self.running = 0
+        self.queue_depth_max = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.hash_time_total = 0.0
+        self.hash_time_last = 0.0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def _admit(self):
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                queued = self.pending - self.running
+                retry_after = math.ceil(
+                    (queued / self.workers + 1) * max(self.hash_time_last, 0.1)
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many signups in progress, please retry shortly",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            self.pending += 1
+            self.submitted += 1
+            self.queue_depth_max = max(self.queue_depth_max, self.pending - self.running)
+
+    def _hash(self, password: str, enqueued_at: float) -> str:
+        start = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            waited = start - enqueued_at
+            self.queue_wait_total += waited
+            self.queue_wait_max = max(self.queue_wait_max, waited)
+        try:
+            return self.hash_fn(password)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.running -= 1
+                self.hash_time_last = elapsed
+                self.hash_time_total += elapsed
+
+    def _finished(self, future):
+        # Also called for a hash cancelled before it ran, which never reaches _hash
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def hash(self, password: str) -> str:
+        """The hash of `password`, computed on the pool; 503 when it is full."""
+        self._admit()
+        future = self._executor.submit(self._hash, password, time.perf_counter())
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            started = finished + self.running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "queue_depth_max": self.queue_depth_max,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "hash_time_avg_ms": round(
+                    self.hash_time_total / finished * 1000 if finished else 0.0, 3
+                ),
+                "queue_wait_avg_ms": round(
+                    self.queue_wait_total / started * 1000 if started else 0.0, 3
+                ),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 3),
+            }
@@ -0,0 +1,51 @@
+"""
+Row serializers for OpenTutorAI responses
+
+A serializer is compiled once per field set into a C-level attrgetter and
+cached, so turning ORM objects or projected rows into response dicts costs a
+single attribute sweep per row. Values are left as-is (datetimes included)
+for orjson to encode natively, which skips FastAPI's jsonable_encoder walk.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Fields that are not columns of the row and are supplied separately
+KEYWORDS_FIELD = "keywords"
+
+
+@lru_cache(maxsize=64)
+def compile_support_serializer(
+    fields: Tuple[str, ...],
+) -> Callable[[Iterable, Optional[Dict[str, List[str]]]], List[dict]]:
+    """
+    Build a serializer emitting `fields` for each row.
+
+    Rows only need the attributes named in `fields` (plus `id` when keywords
+    are requested); keywords are looked up by id in the mapping passed to the
+    serializer.
+    """
+    columns = tuple(field for field in fields if field != KEYWORDS_FIELD)
+    with_keywords = KEYWORDS_FIELD in fields
+
+    if len(columns) == 1:
+        single = attrgetter(columns[0])
+        getter = lambda row: (single(row),)  # noqa: E731
+    elif columns:
+        getter = attrgetter(*columns)
+    else:
+        getter = lambda row: ()  # noqa: E731
+
+    def serialize(rows, keywords=None):
+        if not with_keywords:
+            return [dict(zip(columns, getter(row))) for row in rows]
+
+        keywords = keywords or {}
+        results = []
+        for row in rows:
+            item = dict(zip(columns, getter(row)))
+            item[KEYWORDS_FIELD] = keywords.get(row.id) or None
+            results.append(item)
+        return results
+
+    return serialize
@@ -0,0 +1,145 @@
+"""
+Streaming upload helpers for OpenTutorAI
+
+Uploads are copied in fixed-size chunks to a temporary file next to their
+destination, hashed on the fly, and atomically renamed into place once
+complete, so neither the whole file nor the blocking disk I/O ever lands on
+the event loop.
+
+Starlette parses and spools a whole multipart body before the route runs,
+so a limit checked in the route only applies once an oversized body has
+been received. UploadSizeLimitMiddleware enforces it while the body is
+still arriving.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from typing import Callable, Iterable
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+# Allowance for the multipart boundaries, part headers and other form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the maximum upload size of {max_size} bytes",
+    )
+
+
+def _write_chunk(f, hasher, chunk: bytes):
+    hasher.update(chunk)
+    f.write(chunk)
+
+
+def _discard(f, tmp_path: str):
+    f.close()
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+def _finalize(f):
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    tmp_dir: str,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StoredUpload:
+    """
+    Stream an upload to a new temporary file in `tmp_dir`.
+
+    The returned path is a complete, fsynced file that the caller must move
+    into place or delete. The size limit is checked against the declared size
+    before any copy starts, and again while copying, so no more than the limit
+    is copied; the body has already been received by then, see
+    UploadSizeLimitMiddleware. Nothing is left behind on failure.
+    """
+    if file.size is not None and file.size > max_size:
+        raise _too_large(max_size)
+
+    f = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, dir=tmp_dir, prefix=".upload-", delete=False
+    )
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise _too_large(max_size)
+            await run_in_threadpool(_write_chunk, f, hasher, chunk)
+
+        await run_in_threadpool(_finalize, f)
+    except BaseException:
+        await run_in_threadpool(_discard, f, f.name)
+        raise
+
+    return StoredUpload(path=f.name, size=size, sha256=hasher.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware capping the request body of the upload routes at `paths`.
+
+    A Content-Length over the limit is answered with a 413 before any of the
+    body is read. A body without one, or longer than it claimed, fails with
+    a 413 as soon as it crosses the limit while being parsed. The limit is
+    `max_size()`, read per request so configuration changes apply, plus
+    MULTIPART_OVERHEAD for the rest of the form.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_size: Callable[[], int]):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        max_size = self.max_size()
+        limit = max_size + MULTIPART_OVERHEAD
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                response = JSONResponse(
+                    {"detail": _too_large(max_size).detail},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    headers={"Connection": "close"},
+                )
+                return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing
+                    raise _too_large(max_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,7 +1,9 @@
 # noqa: INP001
+import importlib.util
 import os
 import shutil
 import subprocess
+from pathlib import Path
 from sys import stderr
 
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
@@ -10,6 +12,7 @@ from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 class CustomBuildHook(BuildHookInterface):
     def initialize(self, version, build_data):
         super().initialize(version, build_data)
+        self.compile_changelog(build_data)
         stderr.write(">>> Building Open TutorAI frontend\n")
         npm = shutil.which("npm")
         if npm is None:
@@ -21,3 +24,17 @@ class CustomBuildHook(BuildHookInterface):
         stderr.write("\n### npm run build\n")
         os.environ["APP_BUILD_HASH"] = version
         subprocess.run([npm, "run", "build"], check=True)  # noqa: S603
+
+    def compile_changelog(self, build_data):
+        """Compile CHANGELOG.md to the JSON /api/changelog serves, so workers never parse it."""
+        stderr.write(">>> Compiling CHANGELOG.md\n")
+        path = Path(self.root) / "backend" / "open_tutorai" / "utils" / "changelog.py"
+        # Loaded by path: importing the package would pull in the whole app
+        spec = importlib.util.spec_from_file_location("open_tutorai_changelog", path)
+        changelog = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(changelog)
+        changelog.compile_changelog()
+        # Ignored by git, so included explicitly
+        build_data["force_include"][str(changelog.COMPILED_CHANGELOG_PATH)] = (
+            "open_tutorai/changelog.json"
+        )
@@ -128,18 +128,28 @@ export const uploadSupportFile = async (token: string, supportId: string, file:
 };
 
 /**
- * Get a list of support requests for the current user
+ * Get one page of support requests for the current user, newest first
  * @param token - Authentication token
- * @param status - Optional status filter
- * @returns A promise that resolves to an array of support requests
+ * @param options - Optional status filter, cursor from a previous page, page size and field projection
+ * @returns A promise that resolves to the page items and the cursor of the next page (null on the last page)
  */
-export const getSupportRequests = async (token: string, status?: string) => {
+export const getSupportRequestsPage = async (
+    token: string,
+    options: { status?: string; cursor?: string; limit?: number; fields?: string[] } = {}
+) => {
     let error = null;
 
-    const url = status 
-        ? `${TUTOR_API_BASE_URL}/supports/list?status=${status}` 
+    const params = new URLSearchParams();
+    if (options.status) params.append('status', options.status);
+    if (options.cursor) params.append('cursor', options.cursor);
+    if (options.limit) params.append('limit', `${options.limit}`);
+    if (options.fields && options.fields.length > 0) params.append('fields', options.fields.join(','));
+
+    const query = params.toString();
+    const url = query
+        ? `${TUTOR_API_BASE_URL}/supports/list?${query}`
         : `${TUTOR_API_BASE_URL}/supports/list`;
-        
+
     const res = await fetch(url, {
         method: 'GET',
         headers: {
@@ -150,10 +160,10 @@ export const getSupportRequests = async (token: string, status?: string) => {
     })
         .then(async (res) => {
             if (!res.ok) throw await res.json();
-            return res.json();
-        })
-        .then((json) => {
-            return json;
+            return {
+                items: await res.json(),
+                nextCursor: res.headers.get('X-Next-Cursor')
+            };
         })
         .catch((err) => {
             error = err.detail;